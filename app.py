@@ -1,9 +1,15 @@
 import streamlit as st
-import pandas as pd
-import tempfile
+import io
 import os
+import tempfile
 import logging
-from weekly_report_generator import WeeklyReportGenerator, generate_word_report
+from schema_validator import ALL_SHEETS, read_excel_checked, read_excel_sheets, sheet_names, ExcelSchemaError
+from report_preview import preview_report
+from report_bundle import write_bundle
+from artifact_cache import ArtifactCache, input_hash
+from render_pool import RenderPool
+from task_index import RESULT_COLUMNS, TaskIndex
+from config import INDEX_CONFIG
 
 # 配置Streamlit
 st.set_page_config(
@@ -77,31 +83,96 @@ st.markdown("""
 - 如果PDF版本有格式或提取数据不正确的情况，可下载Word版本手动调整
 """)
 
+@st.cache_resource
+def get_artifact_cache():
+    """生成结果缓存，所有会话共用"""
+    return ArtifactCache()
+
+@st.cache_resource
+def get_render_pool():
+    """预热的生成进程池，所有会话共用"""
+    return RenderPool()
+
+@st.cache_resource
+def get_task_index():
+    """历史任务索引，所有会话共用"""
+    return TaskIndex()
+
+# 批量打包：多份周报Excel生成的PDF/Word打包为一个ZIP下载
+with st.sidebar:
+    st.header("批量打包")
+    bundle_files = st.file_uploader("上传多个周报Excel：", type=["xlsx", "xls"], accept_multiple_files=True, key="bundle_files")
+    if bundle_files:
+        with st.form("bundle_form"):
+            bundle_jobs = []
+            for idx, bundle_file in enumerate(bundle_files):
+                st.caption(bundle_file.name)
+                col1, col2 = st.columns(2)
+                with col1:
+                    bundle_issue = st.text_input("期数", key=f"bundle_issue_{idx}", placeholder="如：1")
+                with col2:
+                    bundle_date = st.text_input("日期", key=f"bundle_date_{idx}", placeholder="如：2025年5月20日")
+                bundle_jobs.append((bundle_file.name, bundle_file.getvalue(), bundle_issue, bundle_date))
+            bundle_submitted = st.form_submit_button("生成ZIP")
+        if bundle_submitted:
+            if not all(job_issue and job_date for _, _, job_issue, job_date in bundle_jobs):
+                st.error("请填写每个文件的期数和日期！")
+            else:
+                with st.spinner("正在生成..."), tempfile.TemporaryFile() as tmp_zip:
+                    manifest = write_bundle(bundle_jobs, tmp_zip, executor=get_render_pool())
+                    for entry in manifest:
+                        if entry['status'] != 'ok':
+                            st.warning(f"{entry['source']} 生成失败：{entry['error']}")
+                    tmp_zip.seek(0)
+                    st.download_button(
+                        "下载ZIP文件",
+                        tmp_zip,
+                        file_name="产品研发部-综合业务组周报汇总.zip",
+                        mime="application/zip",
+                        use_container_width=True,
+                        key="bundle_zip"
+                    )
+
+    # 历史任务搜索：索引由task_index.py或watch_daemon.py --index写入
+    if os.path.exists(INDEX_CONFIG['path']):
+        st.header("历史任务搜索")
+        search_text = st.text_input("关键词", placeholder="如：接口开发", key="search_text")
+        search_name = st.text_input("姓名（可选）", key="search_name")
+        if search_text.strip():
+            found = get_task_index().search(search_text, search_name.strip() or None)
+            st.caption(f"最近的{len(found)}条" if found else "没有找到相关任务")
+            if found:
+                st.dataframe([dict(zip(RESULT_COLUMNS, row)) for row in found], hide_index=True)
+
 # 文件上传（中文提示）
 uploaded_file = st.file_uploader("请上传周报Excel文件：", type=["xlsx", "xls"], help="仅支持Excel格式，直接从企微下载周报")
 
 if uploaded_file:
     try:
-        # 读取Excel数据
-        df = pd.read_excel(uploaded_file)
-        
-        # 验证必需字段
-        required_columns = [
-            '姓名', '工作类型', '项目名称',
-            '项目阶段', '上周三至本周二工作内容', '本周三至下周二工作计划',
-            '问题反馈', '通过简历数量', '面试人员数量', '面试通过人员数量'
-        ]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            st.error(f"Excel文件缺少必需字段：{', '.join(missing_columns)}")
+        # 工作簿有多个工作表时选择其中一个，或全部合并为一份报告（每个工作表一节）
+        sheet_name = 0
+        names = sheet_names(uploaded_file)
+        if len(names) > 1:
+            # 选项直接用ALL_SHEETS和工作表名，名称与“全部”的显示文字相同也不会混淆
+            sheet_name = st.selectbox("工作表", [ALL_SHEETS] + names,
+                                      format_func=lambda name: "全部工作表（合并）" if name is ALL_SHEETS else name)
+
+        # 先校验表头再读取Excel数据
+        try:
+            if sheet_name is ALL_SHEETS:
+                df = read_excel_sheets(uploaded_file)
+            else:
+                df = read_excel_checked(uploaded_file, sheet_name)
+        except ExcelSchemaError as e:
+            st.error("Excel文件不符合模板要求：\n" + "\n".join(f"- {err}" for err in e.errors))
             st.stop()
             
-        # 确保数值字段为数字类型
-        numeric_columns = ['通过简历数量', '面试人员数量', '面试通过人员数量']
-        for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-        st.dataframe(df)
+        if isinstance(df, dict):
+            for tab, frame in zip(st.tabs(list(df)), df.values()):
+                with tab:
+                    st.dataframe(frame)
+        else:
+            st.dataframe(df)
         
         with st.form("report_form"):
             col1, col2 = st.columns(2)
@@ -111,51 +182,40 @@ if uploaded_file:
                 date_str = st.text_input("日期", value="", placeholder="如：2025年5月20日")
             submitted = st.form_submit_button("生成周报")
             
+        # 报告预览：直接渲染为HTML，修改Excel后无需生成PDF/Word即可检查内容
+        with st.expander("报告预览", expanded=True):
+            st.markdown(preview_report(df, issue, date_str), unsafe_allow_html=True)
+            
         # 只要生成过一次，下载按钮就一直显示
         if (submitted and issue and date_str) or ("pdf" in st.session_state and "word" in st.session_state):
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_xlsx:
-                    df.to_excel(tmp_xlsx.name, index=False)
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_pdf, \
-                         tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                        try:
-                            generator = WeeklyReportGenerator(tmp_xlsx.name, tmp_pdf.name, issue, date_str)
-                            generator.run()
-                            generate_word_report(tmp_xlsx.name, tmp_docx.name, issue, date_str)
-                            
-                            btn_col1, btn_col2 = st.columns([1, 1])
-                            with btn_col1:
-                                with open(tmp_pdf.name, "rb") as f:
-                                    st.download_button(
-                                        "下载PDF文件",
-                                        f,
-                                        file_name=f"产品研发部-综合业务组周报汇总-{date_str}.pdf",
-                                        use_container_width=True,
-                                        key="pdf"
-                                    )
-                            with btn_col2:
-                                with open(tmp_docx.name, "rb") as f:
-                                    st.download_button(
-                                        "下载Word文件",
-                                        f,
-                                        file_name=f"产品研发部-综合业务组周报汇总-{date_str}.docx",
-                                        use_container_width=True,
-                                        key="word"
-                                    )
-                        except Exception as e:
-                            logger.error(f"生成报告时出错: {str(e)}")
-                            st.error(f"生成报告时出错: {str(e)}")
-                        finally:
-                            # 清理临时文件
-                            try:
-                                os.unlink(tmp_pdf.name)
-                                os.unlink(tmp_docx.name)
-                            except Exception as e:
-                                logger.error(f"清理临时文件时出错: {str(e)}")
-                os.unlink(tmp_xlsx.name)
+                # 相同文件、期数和日期直接读取缓存文件，无需重新生成；
+                # 未命中时工作进程直接使用上面已校验的数据生成，不再解析Excel
+                outputs = {'pdf': io.BytesIO(), 'docx': io.BytesIO()}
+                get_artifact_cache().render_to(None, issue, date_str, outputs, pool=get_render_pool(),
+                                               sheet_name=sheet_name, digest=input_hash(uploaded_file.getvalue()),
+                                               rows=df)
+                
+                btn_col1, btn_col2 = st.columns([1, 1])
+                with btn_col1:
+                    st.download_button(
+                        "下载PDF文件",
+                        outputs['pdf'].getvalue(),
+                        file_name=f"产品研发部-综合业务组周报汇总-{date_str}.pdf",
+                        use_container_width=True,
+                        key="pdf"
+                    )
+                with btn_col2:
+                    st.download_button(
+                        "下载Word文件",
+                        outputs['docx'].getvalue(),
+                        file_name=f"产品研发部-综合业务组周报汇总-{date_str}.docx",
+                        use_container_width=True,
+                        key="word"
+                    )
             except Exception as e:
-                logger.error(f"处理文件时出错: {str(e)}")
-                st.error(f"处理文件时出错: {str(e)}")
+                logger.error(f"生成报告时出错: {str(e)}")
+                st.error(f"生成报告时出错: {str(e)}")
         elif submitted:
             st.error("请填写期数和日期后再生成下载！")
     except Exception as e:
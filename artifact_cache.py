@@ -0,0 +1,283 @@
+"""按内容寻址的生成结果缓存
+
+键由(输入文件哈希, 期数, 日期, 格式, 渲染版本)计算得到。生成结果是确定的，
+相同请求直接读取缓存文件；超过容量上限时按最近使用时间淘汰。
+写入时只累加本进程估计的总大小，超过上限或距上次扫描超过EVICT_RESCAN_SECONDS时才扫描目录淘汰；
+最近EVICT_GRACE_SECONDS内用过的文件不会被淘汰，调用方取得路径后有足够时间读取。
+缓存目录可被多个进程（网页端、桌面端、命令行）同时使用。
+每个缓存文件旁有同名的.json文件保存生成时的统计信息（行数和耗时），命中缓存时一并返回。
+同一进程内同时请求相同的格式（相同的缓存键）时只生成一次，其余请求等待并共用其结果。
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from config import CACHE_CONFIG
+from schema_validator import sheet_key
+from weekly_report_generator import RENDERER_VERSION, generate_reports, generate_reports_from_rows
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('pdf', 'docx')
+
+# 估计的总大小未超过上限时，至少每隔这么多秒扫描一次目录（计入其他进程写入的文件）
+EVICT_RESCAN_SECONDS = 300
+
+# 最近使用过的文件在这段时间内不淘汰
+EVICT_GRACE_SECONDS = 60
+
+
+def input_hash(source):
+    """Excel内容的sha256，source为路径、bytes或文件对象"""
+    digest = hashlib.sha256()
+    if isinstance(source, bytes):
+        digest.update(source)
+    elif hasattr(source, 'read'):
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            digest.update(chunk)
+        source.seek(0)
+    else:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """生成结果的磁盘缓存，LRU淘汰"""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or CACHE_CONFIG['dir']
+        self.max_bytes = CACHE_CONFIG['max_bytes'] if max_bytes is None else max_bytes
+        os.makedirs(self.root, exist_ok=True)
+        # 正在生成的格式：缓存键 -> Future，结果为(缓存文件路径, 统计信息)
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        # 本进程估计的缓存总大小，None表示尚未扫描
+        self._total_bytes = None
+        self._scanned_at = 0.0
+        self._size_lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+
+    def key(self, digest, issue, date_str, fmt, sheet_name=0):
+        parts = [digest, str(issue), str(date_str), fmt, RENDERER_VERSION]
+        if sheet_name != 0:
+            # 默认只读第一个工作表，此时键与之前保持一致
+            parts.append('sheet=' + sheet_key(sheet_name))
+        raw = '\0'.join(parts)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key, fmt):
+        return os.path.join(self.root, key[:2], f'{key}.{fmt}')
+
+    def get(self, key, fmt):
+        """命中时返回缓存文件路径并更新使用时间，否则返回None"""
+        hit = self._lookup(key, fmt)
+        return hit and hit[0]
+
+    def _lookup(self, key, fmt):
+        """命中时返回(缓存文件路径, 生成时的统计信息)并更新使用时间，否则返回None
+
+        缺少统计信息文件（旧版本写入）的视为未命中，重新生成后补齐。
+        """
+        path = self._path(key, fmt)
+        try:
+            with open(path + '.json', encoding='utf-8') as f:
+                stats = json.load(f)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return path, stats
+
+    def put(self, key, fmt, src_path, stats=None):
+        """将生成的文件和统计信息放入缓存，返回缓存路径"""
+        path = self._path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先复制到同目录临时文件再替换，其他进程不会读到写了一半的文件
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as dst, open(src_path, 'rb') as src:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_path, path)
+        # 统计信息在缓存文件之后写入，读到统计信息时缓存文件已完整
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(stats or {}, f, ensure_ascii=False)
+        os.replace(tmp_path, path + '.json')
+        size = os.path.getsize(path)
+        with self._size_lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size
+            due = (self._total_bytes is None or self._total_bytes > self.max_bytes
+                   or time.monotonic() - self._scanned_at > EVICT_RESCAN_SECONDS)
+        if due:
+            self.evict()
+        return path
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(('.tmp', '.json')):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def evict(self):
+        """扫描缓存目录，超过容量上限时删除最久未使用的文件，并更新估计的总大小
+
+        删除前重新检查使用时间，EVICT_GRACE_SECONDS内用过的文件保留（此时可能暂时超出上限）。
+        """
+        with self._evict_lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            recent = time.time() - EVICT_GRACE_SECONDS
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    if os.stat(path).st_mtime >= recent:
+                        # 按使用时间排序，之后的文件都更新
+                        break
+                    # 先删统计信息，读取方不会得到没有文件的命中
+                    os.unlink(path + '.json')
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            with self._size_lock:
+                self._total_bytes = total
+                self._scanned_at = time.monotonic()
+
+    def render(self, source, issue, date_str, formats=FORMATS, pool=None, sheet_name=0, digest=None, rows=None):
+        """返回({格式: 缓存文件路径}, 统计信息)，缺失的格式才会生成
+
+        pool为RenderPool时在预热的工作进程中生成，否则在当前进程生成。
+        sheet_name与generate_reports相同，可选择工作表或合并多个工作表。
+        调用方已解析过该文件时可传入digest（input_hash的结果）和rows（所选工作表的数据行，
+        合并多个工作表时为read_excel_sheets的结果），
+        此时不再计算哈希，需要生成时也直接使用数据行，不再读取Excel。
+        按格式合并同时到来的请求：某个格式（相同缓存键）正在生成时不再重复生成，等待其完成后
+        使用同一文件（统计信息中coalesced为True），生成失败时一起收到同一异常。
+        命中缓存时返回生成时保存的统计信息，cache_hit为True。
+        """
+        if hasattr(source, 'read'):
+            source = source.read()
+        digest = digest or input_hash(source)
+        keys = {fmt: self.key(digest, issue, date_str, fmt, sheet_name) for fmt in formats}
+        paths, hit_stats = {}, {}
+        for fmt in formats:
+            hit = self._lookup(keys[fmt], fmt)
+            paths[fmt] = hit and hit[0]
+            if hit:
+                hit_stats.update(hit[1])
+        missing = [fmt for fmt in formats if paths[fmt] is None]
+        if not missing:
+            return paths, dict(hit_stats, cache_hit=True)
+
+        # 每个格式一个在途请求：正在生成的格式等待其结果，其余格式由本请求生成
+        flights, waiting = {}, {}
+        with self._flights_lock:
+            for fmt in missing:
+                flight = self._flights.get(keys[fmt])
+                if flight is None:
+                    flights[fmt] = self._flights[keys[fmt]] = Future()
+                else:
+                    waiting[fmt] = flight
+
+        stats = {}
+        if flights:
+            stats = self._lead(source, issue, date_str, keys, flights, paths, pool, sheet_name, rows)
+        if waiting:
+            logger.info(f"相同的生成请求正在进行，等待其结果：{', '.join(waiting)}")
+            for fmt, flight in waiting.items():
+                paths[fmt], flight_stats = flight.result()
+                stats = stats or dict(flight_stats)
+            stats['coalesced'] = True
+        return paths, stats
+
+    def render_to(self, source, issue, date_str, targets, pool=None, sheet_name=0, digest=None, rows=None):
+        """生成（或读取缓存）并复制到targets，返回统计信息
+
+        targets为{格式: 目标路径或可写文件对象}，其余参数与render相同。
+        缓存文件在复制前被其他进程淘汰时重新生成一次。
+        """
+        if hasattr(source, 'read'):
+            source = source.read()
+        for attempt in range(2):
+            paths, stats = self.render(source, issue, date_str, tuple(targets), pool, sheet_name, digest, rows)
+            try:
+                for fmt, target in targets.items():
+                    if hasattr(target, 'write'):
+                        target.seek(0)
+                        target.truncate()
+                        with open(paths[fmt], 'rb') as src:
+                            shutil.copyfileobj(src, target, 1 << 20)
+                    else:
+                        shutil.copyfile(paths[fmt], target)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                logger.warning("缓存文件在读取前已被淘汰，重新生成")
+            else:
+                return stats
+
+    def _lead(self, source, issue, date_str, keys, flights, paths, pool, sheet_name, rows):
+        """生成flights中的格式，结果写入paths并通知等待的请求，返回统计信息"""
+        owned = dict(flights)
+        try:
+            # 查询缓存之后、登记在途请求之前，前一个相同请求可能刚刚完成
+            hit_stats = {}
+            for fmt in list(flights):
+                hit = self._lookup(keys[fmt], fmt)
+                if hit is not None:
+                    paths[fmt] = hit[0]
+                    hit_stats.update(hit[1])
+                    flights.pop(fmt).set_result((hit[0], dict(hit[1], cache_hit=True)))
+            if not flights:
+                return dict(hit_stats, cache_hit=True)
+            missing = list(flights)
+            rendered, stats = self._render_missing(source, issue, date_str, missing, keys, pool, sheet_name, rows)
+        except BaseException as e:
+            for flight in flights.values():
+                flight.set_exception(e)
+            raise
+        else:
+            for fmt, flight in flights.items():
+                flight.set_result((rendered[fmt], stats))
+            paths.update(rendered)
+            logger.info(f"已生成并缓存：{', '.join(missing)}")
+            return stats
+        finally:
+            with self._flights_lock:
+                for fmt, flight in owned.items():
+                    if self._flights.get(keys[fmt]) is flight:
+                        del self._flights[keys[fmt]]
+
+    def _render_missing(self, source, issue, date_str, missing, keys, pool, sheet_name, rows=None):
+        """生成缺失的格式并放入缓存，返回({格式: 缓存文件路径}, 统计信息)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = {fmt: os.path.join(tmp, f'report.{fmt}') for fmt in missing}
+            if rows is not None and pool is not None:
+                stats = pool.render_rows(rows, issue, date_str, outputs.get('pdf'), outputs.get('docx'))
+            elif rows is not None:
+                stats = generate_reports_from_rows(rows, issue, date_str, pdf_path=outputs.get('pdf'),
+                                                   docx_path=outputs.get('docx'))
+            elif pool is not None:
+                stats = pool.render(source, issue, date_str, outputs.get('pdf'), outputs.get('docx'), sheet_name)
+            else:
+                excel = io.BytesIO(source) if isinstance(source, bytes) else source
+                stats = generate_reports(excel, issue, date_str, pdf_path=outputs.get('pdf'),
+                                         docx_path=outputs.get('docx'), sheet_name=sheet_name)
+            paths = {fmt: self.put(keys[fmt], fmt, outputs[fmt], stats) for fmt in missing}
+        return paths, dict(stats, cache_hit=False)
@@ -0,0 +1,645 @@
+"""周报生成器性能基准
+
+用法：
+    python benchmark.py footer --rows 400
+    python benchmark.py story --rows 250 1000 4000
+    python benchmark.py partition --rows 1000 10000 50000
+    python benchmark.py wrap --rows 400 2000
+    python benchmark.py pool --rows 400 --jobs 6
+    python benchmark.py sheets --sheets 6 --rows 2000
+    python benchmark.py export --rows 2000 10000 50000
+    python benchmark.py stress --rows 400 --jobs 8 --workers 1 2 4
+    python benchmark.py masthead --rows 5 --repeat 20
+    python benchmark.py records --rows 10 50 200 250 1000 2000
+    python benchmark.py split --rows 400 --workers 2 4
+    python benchmark.py index --weeks 260 --rows 200
+    python benchmark.py session --rows 30 400 2000
+"""
+import argparse
+import datetime
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+from docx import Document
+
+from config import PROJECT_STAGES, SHEETS_CONFIG
+from member_records import declared_rows, read_entries
+from schema_validator import read_excel_checked, read_excel_sheets
+import weekly_report_generator
+from render_pool import RenderPool, render_report
+import task_export
+from split_reports import generate_split_reports
+from task_index import TaskIndex
+from artifact_cache import ArtifactCache
+from session_model import WorkbookSession
+from weekly_report_generator import BLOCK_STYLES, WeeklyReportGenerator, generate_reports
+
+TASKS = ['持续跟进需求', '参加例会', '完成接口开发', '修复已知bug', '编写技术方案',
+         '进行单元测试', '配合测试环境部署', '整理需求文档并组织评审', '跟进生产问题处理']
+
+
+def make_sample_frame(rows, seed=0):
+    """生成指定行数的模拟周报数据"""
+    rnd = random.Random(seed)
+    departments = [f'部门{i}' for i in range(8)]
+    projects = [f'项目{i}' for i in range(12)] + ['其他']
+    stages = list(PROJECT_STAGES)
+    records = []
+    for i in range(rows):
+        work_type = rnd.choice(['入池', '入项'])
+        records.append({
+            '工号': f'{i:05d}',
+            '姓名': f'成员{i % max(rows // 2, 1)}',
+            '工作类型': work_type,
+            '项目名称': rnd.choice(projects),
+            '入池部门': rnd.choice(departments) if work_type == '入池' else None,
+            '项目阶段': rnd.choice(stages),
+            '上周三至本周二工作内容': '\n'.join(f'{n}. {rnd.choice(TASKS)}' for n in range(1, rnd.randint(2, 5))),
+            '本周三至下周二工作计划': '\n'.join(f'{n}. {rnd.choice(TASKS)}' for n in range(1, rnd.randint(2, 5))),
+            '问题反馈': '暂无',
+            '通过简历数量': rnd.randint(0, 3),
+            '面试人员数量': rnd.randint(0, 2),
+            '面试通过人员数量': rnd.randint(0, 1),
+        })
+    return pd.DataFrame(records)
+
+
+def make_sample_excel(path, rows, seed=0):
+    make_sample_frame(rows, seed).to_excel(path, index=False)
+    return path
+
+
+def _timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_footer(args):
+    """页眉页脚总页数：单次排版与两次排版的耗时对比"""
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = make_sample_excel(os.path.join(tmp, 'bench.xlsx'), args.rows)
+        generator = WeeklyReportGenerator(excel_path, os.path.join(tmp, 'bench.pdf'), '1', '2024年1月1日')
+        generator.load_excel_data()
+
+        calls = []
+        header_footer = generator._header_footer
+        generator._header_footer = lambda canvas, doc: (calls.append(doc.page), header_footer(canvas, doc))
+        generator.generate_pdf()
+        pages = len(calls)
+        generator._header_footer = header_footer
+
+        single = _timed(generator.generate_pdf, args.repeat)
+        double = _timed(lambda: (generator.generate_pdf(), generator.generate_pdf()), args.repeat)
+
+    print(f"rows={args.rows} pages={pages} 页面回调次数={len(calls)}（排版遍数={len(calls) / pages:.0f}）")
+    print(f"单次排版（延迟总页数）: {single * 1000:.1f} ms")
+    print(f"两次排版（对照）:       {double * 1000:.1f} ms  ({double / single:.2f}x)")
+
+
+# 新进程中加载数据后生成一次PDF，输出生成前的RSS和生成期间的RSS峰值（KB）
+# 读取Excel的峰值可能高于生成PDF，生成前通过/proc/self/clear_refs重置峰值，只统计生成期间（Linux）
+_STORY_RSS_RUN = """
+import re, sys
+from weekly_report_generator import WeeklyReportGenerator
+
+def status(field):
+    with open('/proc/self/status') as f:
+        return int(re.search(field + r':\\s+(\\d+)', f.read()).group(1))
+
+generator = WeeklyReportGenerator(sys.argv[1], sys.argv[2], '1', '2024年1月1日')
+generator.load_excel_data()
+before = status('VmRSS')
+with open('/proc/self/clear_refs', 'w') as f:
+    f.write('5')
+generator.generate_pdf(streaming=sys.argv[3] == '1')
+print(before, status('VmHWM'))
+"""
+
+
+def _story_rss(excel_path, pdf_path, streaming):
+    """新进程中生成PDF，返回(生成前RSS MB, 生成期间RSS峰值MB)；每种方式单独一个进程"""
+    output = subprocess.run([sys.executable, '-c', _STORY_RSS_RUN, excel_path, pdf_path, '1' if streaming else '0'],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    return int(output[0]) / 1024, int(output[1]) / 1024
+
+
+def bench_story(args):
+    """story列表与流式story的PDF生成内存：Python对象峰值（tracemalloc）和进程RSS峰值
+
+    流式story只减少story本身的内存，reportlab排好的页面仍保留到保存，RSS峰值仍随行数增长。
+    """
+    print(f"{'rows':>6} {'列表峰值MB':>12} {'流式峰值MB':>12} {'列表RSS MB':>12} {'流式RSS MB':>12} "
+          f"{'列表RSS增量':>12} {'流式RSS增量':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            excel_path = make_sample_excel(os.path.join(tmp, f'bench_{rows}.xlsx'), rows)
+            pdf_path = os.path.join(tmp, 'bench.pdf')
+            generator = WeeklyReportGenerator(excel_path, pdf_path, '1', '2024年1月1日')
+            generator.load_excel_data()
+            peaks = []
+            for streaming in (False, True):
+                tracemalloc.start()
+                generator.generate_pdf(streaming=streaming)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+                tracemalloc.stop()
+            if sys.platform.startswith('linux'):
+                rss = [_story_rss(excel_path, pdf_path, streaming) for streaming in (False, True)]
+            else:
+                rss = [(float('nan'), float('nan'))] * 2
+            print(f"{rows:>6} {peaks[0]:>12.1f} {peaks[1]:>12.1f} {rss[0][1]:>12.1f} {rss[1][1]:>12.1f} "
+                  f"{rss[0][1] - rss[0][0]:>12.1f} {rss[1][1] - rss[1][0]:>12.1f}")
+
+
+def bench_partition(args):
+    """数据预处理与分组：耗时和内存峰值（不含PDF排版）"""
+    print(f"{'rows':>6} {'预处理+分组ms':>14} {'内存峰值MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = make_sample_frame(rows)
+            # 经过一次Excel读写，保证列类型与实际上传一致
+            excel_path = os.path.join(tmp, f'bench_{rows}.xlsx')
+            df.to_excel(excel_path, index=False)
+            df = read_excel_checked(excel_path)
+            generator = WeeklyReportGenerator(excel_path, None, '1', '2024年1月1日')
+
+            def run():
+                generator.load_dataframe(df)
+                for _ in generator.iter_blocks():
+                    pass
+
+            elapsed = _timed(run, args.repeat)
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            print(f"{rows:>6} {elapsed * 1000:>14.1f} {peak:>12.1f}")
+
+
+def bench_wrap(args):
+    """段落换行耗时：默认换行、CJK换行、CJK换行加宽度缓存"""
+    width, height = A4[0] - 144, A4[1] - 144
+    cache = weekly_report_generator._cached_width
+    print(f"{'rows':>6} {'段落数':>6} {'默认换行ms':>10} {'CJK无缓存ms':>11} {'CJK缓存冷ms':>11} {'CJK缓存热ms':>11} {'命中率':>6}")
+    for rows in args.rows:
+        generator = WeeklyReportGenerator(None, None, '1', '2024年1月1日')
+        generator.load_dataframe(read_excel_checked(_excel_bytes(rows)))
+        blocks = [(f"<b>{value}</b>", 'ChineseBold') if kind == 'project' else (value, BLOCK_STYLES[kind])
+                  for kind, value in generator.iter_blocks() if kind != 'spacer']
+        default_styles = {name: ParagraphStyle(name, parent=generator.styles[name], wordWrap=None)
+                          for name in set(name for _, name in blocks)}
+
+        def wrap_all(styles):
+            # Paragraph在构造时解析标记，只计换行时间
+            paragraphs = [Paragraph(text, styles[name]) for text, name in blocks]
+            start = time.perf_counter()
+            for paragraph in paragraphs:
+                paragraph.wrap(width, height)
+            return time.perf_counter() - start
+
+        results = []
+        try:
+            weekly_report_generator.uninstall_string_width_cache()
+            results.append(min(wrap_all(default_styles) for _ in range(args.repeat)))
+            results.append(min(wrap_all(generator.styles) for _ in range(args.repeat)))
+            weekly_report_generator.install_string_width_cache()
+            cache.cache_clear()
+            results.append(wrap_all(generator.styles))
+            results.append(min(wrap_all(generator.styles) for _ in range(args.repeat)))
+            info = cache.cache_info()
+        finally:
+            weekly_report_generator.uninstall_string_width_cache()
+        hit_rate = info.hits / max(info.hits + info.misses, 1)
+        print(f"{rows:>6} {len(blocks):>6} " + ' '.join(f"{value * 1000:>11.1f}" for value in results)
+              + f" {hit_rate:>6.1%}")
+
+
+def _excel_bytes(rows):
+    buffer = io.BytesIO()
+    make_sample_frame(rows).to_excel(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def bench_pool(args):
+    """首份报告延迟：新进程冷启动、预热进程池与当前进程热生成对比"""
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = make_sample_excel(os.path.join(tmp, 'bench.xlsx'), args.rows)
+        outputs = (excel_path, '1', '2024年1月1日', os.path.join(tmp, 'bench.pdf'), os.path.join(tmp, 'bench.docx'))
+
+        # 当前进程已完成导入和初始化，第二次生成即为热生成耗时
+        render_report(*outputs)
+        warm = _timed(lambda: render_report(*outputs), args.repeat)
+
+        # 未预热：新启动(spawn)的进程直接执行任务，首个任务承担导入和初始化
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            start = time.perf_counter()
+            executor.submit(render_report, *outputs).result()
+            cold = time.perf_counter() - start
+
+        with RenderPool(workers=1, max_tasks_per_child=args.max_tasks) as pool:
+            latencies = []
+            for _ in range(args.jobs):
+                start = time.perf_counter()
+                pool.render(*outputs)
+                latencies.append(time.perf_counter() - start)
+            health = pool.health()
+        first, steady = latencies[0], sorted(latencies[1:])[(len(latencies) - 1) // 2]
+
+    print(f"rows={args.rows} 每进程任务上限={args.max_tasks}")
+    print(f"当前进程热生成:       {warm * 1000:.1f} ms")
+    print(f"未预热进程首份报告:   {cold * 1000:.1f} ms")
+    print(f"预热进程池首份报告:   {first * 1000:.1f} ms")
+    print(f"预热进程池后续中位数: {steady * 1000:.1f} ms")
+    print(f"进程池统计: {health}")
+
+
+def bench_sheets(args):
+    """多工作表读取：逐表单独打开工作簿、打开一次依次解析、每个工作表一个进程并行解析对比"""
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = os.path.join(tmp, 'bench.xlsx')
+        names = [f'第{i + 1}组' for i in range(args.sheets)]
+        with pd.ExcelWriter(excel_path) as writer:
+            for i, name in enumerate(names):
+                make_sample_frame(args.rows, seed=i).to_excel(writer, sheet_name=name, index=False)
+
+        per_sheet = _timed(lambda: [read_excel_checked(excel_path, name) for name in names], args.repeat)
+        shared = _timed(lambda: read_excel_sheets(excel_path, max_workers=1), args.repeat)
+        SHEETS_CONFIG['min_bytes'] = 0
+        parallel = _timed(lambda: read_excel_sheets(excel_path, max_workers=args.workers), args.repeat)
+        size = os.path.getsize(excel_path)
+
+    print(f"sheets={args.sheets} rows/sheet={args.rows} cpu={os.cpu_count()} workers={args.workers} "
+          f"size={size / 1024:.0f}KB")
+    print(f"逐表打开工作簿:       {per_sheet * 1000:.1f} ms")
+    print(f"打开一次，依次解析:   {shared * 1000:.1f} ms")
+    print(f"多进程并行解析:       {parallel * 1000:.1f} ms")
+
+
+def bench_export(args):
+    """任务明细导出：各格式的吞吐和内存峰值，与先构建完整DataFrame再写出对比"""
+    formats = list(task_export.FORMATS)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        formats.remove('parquet')
+    print(f"{'rows':>6} {'任务行':>8} {'格式':>14} {'耗时ms':>9} {'行/秒':>9} {'内存峰值MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            generator = WeeklyReportGenerator(None, None, '1', '2024年1月1日')
+            generator.load_dataframe(make_sample_frame(rows))
+            runs = [(fmt, lambda fmt=fmt: task_export.export_generator(generator, os.path.join(tmp, f'tasks.{fmt}')))
+                    for fmt in formats]
+            # 对照：先构建完整的明细DataFrame再整体写出
+            runs.append(('xlsx(DataFrame)', lambda: pd.DataFrame(
+                task_export.iter_task_records(generator), columns=task_export.EXPORT_COLUMNS
+            ).to_excel(os.path.join(tmp, 'tasks_df.xlsx'), index=False)))
+            count = sum(1 for _ in task_export.iter_task_records(generator))
+            for name, run in runs:
+                elapsed = _timed(run, 1)
+                tracemalloc.start()
+                run()
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                print(f"{rows:>6} {count:>8} {name:>14} {elapsed * 1000:>9.0f} {count / elapsed:>9.0f} {peak:>10.1f}")
+
+
+def _render_digests(excel_path, out_dir, index):
+    """生成一份PDF和Word，返回两者的sha256；可在线程或进程中执行"""
+    pdf_path = os.path.join(out_dir, f'stress_{index}.pdf')
+    docx_path = os.path.join(out_dir, f'stress_{index}.docx')
+    generate_reports(excel_path, '1', '2024年1月1日', pdf_path=pdf_path, docx_path=docx_path)
+    digests = []
+    for path in (pdf_path, docx_path):
+        with open(path, 'rb') as f:
+            digests.append(hashlib.sha256(f.read()).hexdigest())
+        os.unlink(path)
+    return tuple(digests)
+
+
+def bench_stress(args):
+    """并发生成：多线程/多进程同时生成同一份周报，校验输出一致并统计吞吐"""
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = make_sample_excel(os.path.join(tmp, 'bench.xlsx'), args.rows)
+        reference = _render_digests(excel_path, tmp, 'ref')
+        print(f"rows={args.rows} jobs={args.jobs}")
+        print(f"{'模式':>4} {'并发':>4} {'耗时s':>8} {'份/秒':>8} {'加速比':>6} {'一致':>4}")
+        failed = False
+        for mode, executor_cls in (('线程', ThreadPoolExecutor), ('进程', ProcessPoolExecutor)):
+            baseline = None
+            for workers in args.workers:
+                with executor_cls(max_workers=workers) as executor:
+                    # 预热工作进程，不计入耗时
+                    list(executor.map(_render_digests, [excel_path] * workers, [tmp] * workers,
+                                      [f'warm{i}' for i in range(workers)]))
+                    start = time.perf_counter()
+                    results = list(executor.map(_render_digests, [excel_path] * args.jobs, [tmp] * args.jobs,
+                                                range(args.jobs)))
+                    elapsed = time.perf_counter() - start
+                baseline = baseline or elapsed
+                same = all(result == reference for result in results)
+                failed = failed or not same
+                print(f"{mode:>4} {workers:>4} {elapsed:>8.2f} {args.jobs / elapsed:>8.2f} "
+                      f"{baseline / elapsed:>6.2f} {'是' if same else '否':>4}")
+    if failed:
+        raise SystemExit('并发生成的输出与串行生成不一致')
+
+
+def bench_masthead(args):
+    """预编译报头：一次性构建耗时、每份报告的报头耗时，以及小报告的总生成耗时"""
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+
+    def masthead_pdf(masthead):
+        for flowable in masthead.iter_pdf('2024 年第 1 期', '2024年1月1日', doc.width):
+            flowable.wrap(doc.width, doc.height)
+
+    build = _timed(weekly_report_generator.Masthead, args.repeat)
+    masthead = weekly_report_generator.get_masthead()
+    pdf = _timed(lambda: masthead_pdf(masthead), args.repeat)
+    documents = [Document() for _ in range(args.repeat)]
+    docx = _timed(lambda: masthead.add_to_docx(documents.pop(), '2024 年第 1 期', '2024年1月1日'), args.repeat)
+    print(f"一次性构建报头（样式、段落、Word片段）: {build * 1000:.2f} ms")
+    print(f"每份报告的报头：PDF {pdf * 1000:.2f} ms，Word {docx * 1000:.2f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = make_sample_excel(os.path.join(tmp, 'bench.xlsx'), args.rows)
+        generator = WeeklyReportGenerator(excel_path, os.path.join(tmp, 'bench.pdf'), '1', '2024年1月1日')
+        generator.load_excel_data()
+        pdf_total = _timed(generator.generate_pdf, args.repeat)
+        docx_total = _timed(lambda: generator.generate_word(os.path.join(tmp, 'bench.docx')), args.repeat)
+    print(f"rows={args.rows} 生成总耗时：PDF {pdf_total * 1000:.1f} ms，Word {docx_total * 1000:.1f} ms")
+
+
+# 新进程中导入并生成一份报告，用于比较两种读取路径的启动耗时
+_COLD_RUN = """
+import sys, time
+start = time.perf_counter()
+from weekly_report_generator import generate_reports
+generate_reports(sys.argv[1], '1', '2024年1月1日', pdf_path=sys.argv[2], docx_path=sys.argv[3])
+print(time.perf_counter() - start, 'pandas' in sys.modules)
+"""
+
+
+def _cold_run(excel_path, tmp, fast_path_rows):
+    env = dict(os.environ, WEEKLY_REPORT_FAST_PATH_ROWS=str(fast_path_rows))
+    output = subprocess.run([sys.executable, '-c', _COLD_RUN, excel_path, os.path.join(tmp, 'cold.pdf'),
+                             os.path.join(tmp, 'cold.docx')], env=env, capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    return float(output[0]), output[1] == 'True'
+
+
+def bench_records(args):
+    """记录路径与DataFrame路径：读取汇总耗时、内存峰值、输出一致性，以及新进程生成一份报告的总耗时"""
+    def load_frame(path):
+        generator = WeeklyReportGenerator(path, None, '1', '2024年1月1日')
+        generator.load_dataframe(read_excel_checked(path))
+        return generator
+
+    def load_records(path):
+        generator = WeeklyReportGenerator(path, None, '1', '2024年1月1日')
+        generator.load_entries(read_entries(path))
+        return generator
+
+    print(f"{'rows':>6} {'DataFrame ms':>13} {'记录 ms':>9} {'DataFrame MB':>13} {'记录 MB':>9} {'一致':>4}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            excel_path = make_sample_excel(os.path.join(tmp, f'bench_{rows}.xlsx'), rows)
+            results = []
+            for load in (load_frame, load_records):
+                elapsed = _timed(lambda: load(excel_path), args.repeat)
+                tracemalloc.start()
+                generator = load(excel_path)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                results.append((elapsed, peak, list(generator.iter_blocks())))
+            same = results[0][2] == results[1][2]
+            print(f"{rows:>6} {results[0][0] * 1000:>13.1f} {results[1][0] * 1000:>9.1f} "
+                  f"{results[0][1]:>13.2f} {results[1][1]:>9.2f} {'是' if same else '否':>4}")
+
+        # load_excel_data自行选择路径：超出上限的表应与关闭记录路径时耗时相同（只多一次声明行数的检查）
+        max_rows = weekly_report_generator.FAST_PATH_CONFIG['max_rows']
+        print(f"load_excel_data，记录路径上限{max_rows}行与关闭（0）对比，交替运行取最小值：")
+        print(f"{'rows':>6} {f'上限{max_rows} ms':>11} {'关闭 ms':>9} {'行数检查 ms':>11}")
+        for rows in args.rows:
+            excel_path = os.path.join(tmp, f'bench_{rows}.xlsx')
+            best = {max_rows: float('inf'), 0: float('inf')}
+            try:
+                for _ in range(args.repeat):
+                    for limit in best:
+                        weekly_report_generator.FAST_PATH_CONFIG['max_rows'] = limit
+                        elapsed = _timed(lambda: WeeklyReportGenerator(excel_path, None, '1', '2024年1月1日')
+                                         .load_excel_data(), 1)
+                        best[limit] = min(best[limit], elapsed)
+            finally:
+                weekly_report_generator.FAST_PATH_CONFIG['max_rows'] = max_rows
+            probe = _timed(lambda: declared_rows(excel_path), args.repeat)
+            print(f"{rows:>6} {best[max_rows] * 1000:>11.1f} {best[0] * 1000:>9.1f} {probe * 1000:>11.2f}")
+
+        excel_path = make_sample_excel(os.path.join(tmp, 'cold.xlsx'), args.cold_rows)
+        print(f"新进程导入并生成一份{args.cold_rows}行的报告（PDF+Word），取{args.repeat}次最小值：")
+        for label, fast_path_rows in (('DataFrame', 0), ('记录', args.cold_rows)):
+            runs = [_cold_run(excel_path, tmp, fast_path_rows) for _ in range(args.repeat)]
+            print(f"  {label}: {min(seconds for seconds, _ in runs) * 1000:.0f} ms"
+                  f"（导入pandas：{'是' if runs[0][1] else '否'}）")
+
+
+def bench_split(args):
+    """拆分子报告：每个范围重新读取Excel筛选生成，与解析一次后依次/并行生成对比"""
+    with tempfile.TemporaryDirectory() as tmp:
+        excel_path = make_sample_excel(os.path.join(tmp, 'bench.xlsx'), args.rows)
+        generator = WeeklyReportGenerator(excel_path, None, '1', '2024年1月1日')
+        generator.load_excel_data()
+        scopes = [(kind, name) for kind, name, _ in generator.iter_scopes()]
+        print(f"rows={args.rows} 子报告={len(scopes)}份（PDF+Word）")
+
+        def reparse():
+            # 对照：每个范围重新读取整个Excel，筛选后生成
+            for kind, name in scopes:
+                df = read_excel_checked(excel_path)
+                work_type, column = ('入池', '入池部门') if kind == '入池部门' else ('入项', '项目名称')
+                sub = WeeklyReportGenerator(None, os.path.join(tmp, 'reparse.pdf'), '1', '2024年1月1日')
+                sub.load_rows(df[(df['工作类型'] == work_type) & (df[column] == name)], name)
+                sub.generate_pdf()
+                sub.generate_word(os.path.join(tmp, 'reparse.docx'))
+
+        elapsed = _timed(reparse, 1)
+        print(f"{'每个范围重新解析':>12}: {elapsed:.2f} s")
+        elapsed = _timed(lambda: generate_split_reports(excel_path, '1', '2024年1月1日', os.path.join(tmp, 'out')), 1)
+        print(f"{'解析一次、依次生成':>12}: {elapsed:.2f} s")
+        for workers in args.workers:
+            with RenderPool(workers=workers) as pool:
+                elapsed = _timed(lambda: generate_split_reports(excel_path, '1', '2024年1月1日',
+                                                                os.path.join(tmp, 'out'), executor=pool), 1)
+            print(f"{f'解析一次、{workers}进程并行':>12}: {elapsed:.2f} s")
+
+
+def bench_index(args):
+    """历史任务索引：逐周写入的耗时、索引大小，以及写满后的查询延迟"""
+    start_date = datetime.date(2021, 1, 5)
+    queries = ['接口开发', '单元测试', '需求 分析', 'bug', '部署', '测']
+    with tempfile.TemporaryDirectory() as tmp:
+        index = TaskIndex(os.path.join(tmp, 'tasks.db'))
+        ingest, tasks = [], 0
+        for week in range(args.weeks):
+            day = start_date + datetime.timedelta(weeks=week)
+            generator = WeeklyReportGenerator(None, None, str(week + 1), f'{day.year}年{day.month}月{day.day}日')
+            generator.load_dataframe(make_sample_frame(args.rows, seed=week))
+            start = time.perf_counter()
+            tasks += index.add_generator(generator, digest=str(week))
+            ingest.append(time.perf_counter() - start)
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        ingest.sort()
+        print(f"weeks={args.weeks} rows={args.rows} 任务={tasks} 索引大小={size / 2**20:.1f}MB")
+        print(f"每周写入 p50 {ingest[len(ingest) // 2] * 1000:.1f}ms  最大 {ingest[-1] * 1000:.1f}ms")
+        # 最后一周重复写入：内容未变化时跳过
+        elapsed = _timed(lambda: index.add_generator(generator, digest=str(args.weeks - 1)), 1)
+        print(f"重复写入（跳过） {elapsed * 1000:.1f}ms")
+
+        print(f"{'查询':>10} {'结果':>6} {'p50 ms':>8} {'最大 ms':>8}")
+        for query in queries + [f'{queries[0]} --name 成员1']:
+            text, _, name = query.partition(' --name ')
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                rows = index.search(text, name or None)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(f"{query:>10} {len(rows):>6} {latencies[len(latencies) // 2] * 1000:>8.1f} "
+                  f"{latencies[-1] * 1000:>8.1f}")
+
+
+def bench_session(args):
+    """桌面端一次会话：预览后导出PDF、Word各两次，每次重新读取与共用一次解析结果对比"""
+    print(f"{'rows':>6} {'方式':>10} {'预览ms':>8} {'首次导出ms':>10} {'重复导出ms':>10} {'解析次数':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            excel_path = make_sample_excel(os.path.join(tmp, f'bench{rows}.xlsx'), rows)
+
+            def per_file(cache):
+                # 原方式：预览读取一次，每次导出计算哈希，未命中时重新解析
+                start = time.perf_counter()
+                pd.read_excel(excel_path)
+                preview = time.perf_counter() - start
+                exports = []
+                for fmt in ('pdf', 'docx', 'pdf', 'docx'):
+                    start = time.perf_counter()
+                    cache.render(excel_path, '1', '2024年1月1日', (fmt,))
+                    exports.append(time.perf_counter() - start)
+                return preview, exports, 3
+
+            def per_session(cache):
+                session = WorkbookSession()
+                start = time.perf_counter()
+                session.get(excel_path)
+                preview = time.perf_counter() - start
+                exports = []
+                for fmt in ('pdf', 'docx', 'pdf', 'docx'):
+                    start = time.perf_counter()
+                    model = session.get(excel_path)
+                    cache.render(None, '1', '2024年1月1日', (fmt,), digest=model.digest, rows=model.rows)
+                    exports.append(time.perf_counter() - start)
+                session.shutdown()
+                return preview, exports, 1
+
+            for name, run in (('每次读取', per_file), ('会话解析', per_session)):
+                preview, exports, parses = run(ArtifactCache(tempfile.mkdtemp(dir=tmp)))
+                print(f"{rows:>6} {name:>10} {preview * 1000:>8.0f} {sum(exports[:2]) * 1000:>10.0f} "
+                      f"{sum(exports[2:]) * 1000:>10.1f} {parses:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='周报生成器性能基准')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('footer', help='页脚总页数的排版耗时')
+    p.add_argument('--rows', type=int, default=400)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_footer)
+
+    p = sub.add_parser('story', help='流式story的内存峰值和进程RSS')
+    p.add_argument('--rows', type=int, nargs='+', default=[250, 1000, 4000])
+    p.set_defaults(func=bench_story)
+
+    p = sub.add_parser('partition', help='预处理与分组的耗时和内存')
+    p.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_partition)
+
+    p = sub.add_parser('wrap', help='段落换行耗时')
+    p.add_argument('--rows', type=int, nargs='+', default=[400, 2000])
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_wrap)
+
+    p = sub.add_parser('pool', help='预热进程池的首份报告延迟')
+    p.add_argument('--rows', type=int, default=400)
+    p.add_argument('--jobs', type=int, default=6)
+    p.add_argument('--max-tasks', type=int, default=50)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_pool)
+
+    p = sub.add_parser('sheets', help='多工作表读取耗时')
+    p.add_argument('--sheets', type=int, default=6)
+    p.add_argument('--rows', type=int, default=2000)
+    p.add_argument('--workers', type=int, default=SHEETS_CONFIG['workers'], help='并行解析的进程数')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_sheets)
+
+    p = sub.add_parser('export', help='任务明细导出的吞吐和内存')
+    p.add_argument('--rows', type=int, nargs='+', default=[2000, 10000, 50000])
+    p.set_defaults(func=bench_export)
+
+    p = sub.add_parser('stress', help='并发生成的一致性和吞吐')
+    p.add_argument('--rows', type=int, default=400)
+    p.add_argument('--jobs', type=int, default=8)
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    p.set_defaults(func=bench_stress)
+
+    p = sub.add_parser('masthead', help='预编译报头的耗时')
+    p.add_argument('--rows', type=int, default=5)
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_masthead)
+
+    p = sub.add_parser('records', help='不依赖pandas的读取路径')
+    p.add_argument('--rows', type=int, nargs='+', default=[10, 50, 200, 250, 1000, 2000])
+    p.add_argument('--cold-rows', type=int, default=30)
+    p.add_argument('--repeat', type=int, default=5)
+    p.set_defaults(func=bench_records)
+
+    p = sub.add_parser('split', help='按部门、项目拆分子报告的耗时')
+    p.add_argument('--rows', type=int, default=400)
+    p.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    p.set_defaults(func=bench_split)
+
+    p = sub.add_parser('index', help='历史任务索引的写入和查询耗时')
+    p.add_argument('--weeks', type=int, default=260)
+    p.add_argument('--rows', type=int, default=200)
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_index)
+
+    p = sub.add_parser('session', help='桌面端会话解析缓存的导出耗时')
+    p.add_argument('--rows', type=int, nargs='+', default=[30, 400, 2000])
+    p.set_defaults(func=bench_session)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,12 @@
+import os
+
 # Excel字段映射配置
 EXCEL_MAPPING = {
     'employee_id': '工号',
     'name': '姓名',
     'work_type': '工作类型',
-    'project_name': '项目名称/入池机构-项目名称',
+    'project_name': '项目名称',
+    'pool_department': '入池部门',
     'project_stage': '项目阶段',
     'last_week_work': '上周三至本周二工作内容',
     'next_week_plan': '本周三至下周二工作计划',
@@ -13,6 +16,17 @@ EXCEL_MAPPING = {
     'interview_pass_count': '面试通过人员数量'
 }
 
+# 非必填字段（生成报告时不使用）
+OPTIONAL_FIELDS = ['employee_id']
+
+# 数值字段
+NUMERIC_FIELDS = ['resume_count', 'interview_count', 'interview_pass_count']
+
+# 旧模板字段名映射（用于提示已更名的列）
+COLUMN_ALIASES = {
+    '项目名称/入池机构-项目名称': '项目名称'
+}
+
 # PDF格式配置
 PDF_CONFIG = {
     'title': {
@@ -52,4 +66,35 @@ PROJECT_STAGES = {
 WORK_TYPES = {
     '入池': '入池工作',
     '入项': '综合业务组项目'
-} 
\ No newline at end of file
+}
+
+# 生成结果缓存配置（网页端、桌面端和命令行共用）
+CACHE_CONFIG = {
+    'dir': os.environ.get('WEEKLY_REPORT_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'weekly-report-generator')),
+    'max_bytes': 512 * 1024 * 1024
+}
+
+# 生成进程池配置：进程数和每个进程处理多少个任务后替换
+RENDER_POOL_CONFIG = {
+    'workers': int(os.environ.get('WEEKLY_REPORT_WORKERS', min(os.cpu_count() or 1, 4))),
+    'max_tasks_per_child': 50
+}
+
+# 不依赖pandas的读取路径：数据行数不超过该值时使用，0为始终使用pandas
+FAST_PATH_CONFIG = {
+    'max_rows': int(os.environ.get('WEEKLY_REPORT_FAST_PATH_ROWS', 200))
+}
+
+# 多工作表解析：工作簿不小于min_bytes时各工作表在独立进程中并行解析，workers为1时始终依次解析
+SHEETS_CONFIG = {
+    'workers': int(os.environ.get('WEEKLY_REPORT_SHEET_WORKERS', min(os.cpu_count() or 1, 4))),
+    'min_bytes': int(os.environ.get('WEEKLY_REPORT_SHEET_PARALLEL_BYTES', 512 * 1024))
+}
+
+# 历史任务全文索引；不放在缓存目录中，避免被缓存淘汰删除
+INDEX_CONFIG = {
+    'path': os.environ.get('WEEKLY_REPORT_INDEX_PATH',
+                           os.path.join(os.path.expanduser('~'), '.local', 'share', 'weekly-report-generator',
+                                        'tasks.db'))
+}
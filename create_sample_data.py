@@ -5,7 +5,8 @@ data = {
     '工号': ['001', '002', '003'],
     '姓名': ['张三', '李四', '王五'],
     '工作类型': ['入池', '入项', '入池'],
-    '项目名称/入池机构-项目名称': ['软件开发中心-京征程项目', '运维工作台项目', '软件开发中心-京征程项目'],
+    '项目名称': ['京征程项目', '运维工作台项目', '京征程项目'],
+    '入池部门': ['软件开发中心', None, '软件开发中心'],
     '项目阶段': ['开发迭代中', '已立项进行中', '开发迭代中'],
     '上周三至本周二工作内容': [
         '1. 完成用户登录模块开发\n2. 修复已知bug',
@@ -0,0 +1,272 @@
+"""网页端并发压测
+
+用Streamlit的AppTest在同一进程中模拟多个会话同时使用app.py：上传不同大小的周报Excel、
+填写期数日期并生成。AppTest不支持文件上传，这里把st.file_uploader替换为从会话状态读取
+合成文件的替身，其余代码（校验、预览、缓存、生成进程池、下载按钮）与线上一致。
+
+统计生成请求的p50/p95/p99延迟、吞吐、进程树内存峰值，以及结束后临时目录中残留的文件。
+生成结果缓存和临时目录都放在本次压测的独立目录中，每次结果可重复。
+
+用法：
+    python load_test.py --sessions 30 --concurrency 10 --rows 50 400 2000
+"""
+import argparse
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# 会话状态中存放合成上传文件的键
+UPLOAD_KEY = '_load_test_upload'
+
+
+class SyntheticUpload(io.BytesIO):
+    """模拟Streamlit的UploadedFile：文件内容加文件名"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _file_uploader_stand_in(label, *args, accept_multiple_files=False, **kwargs):
+    """替代st.file_uploader：主上传框返回会话中的合成文件，批量打包上传框为空"""
+    import streamlit as st
+    if accept_multiple_files:
+        return []
+    return st.session_state.get(UPLOAD_KEY)
+
+
+def _patch_streamlit():
+    """让并发的AppTest共用一个模拟Runtime
+
+    AppTest每次运行开始时设置、结束时清空全局的Runtime实例，多个会话同时运行会互相清掉；
+    这里固定返回同一个模拟实例（与AppTest构造方式相同），并替换文件上传控件。
+    """
+    import streamlit as st
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    saved = (Runtime.__dict__['instance'], Runtime.__dict__['exists'], st.file_uploader)
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    st.file_uploader = _file_uploader_stand_in
+    # 压测线程在脚本运行之外设置会话状态，忽略随之产生的“missing ScriptRunContext”警告
+    context_logger = logging.getLogger('streamlit.runtime.scriptrunner.script_run_context')
+    context_filter = lambda record: 'missing ScriptRunContext' not in record.getMessage()
+    context_logger.addFilter(context_filter)
+
+    def restore():
+        Runtime.instance, Runtime.exists, st.file_uploader = saved
+        context_logger.removeFilter(context_filter)
+    return restore
+
+
+def _process_rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def tree_rss_kb(pid=None):
+    """进程及其全部子进程（生成进程池）的常驻内存之和，单位KB；仅Linux"""
+    pending, total = [pid or os.getpid()], 0
+    while pending:
+        current = pending.pop()
+        total += _process_rss_kb(current)
+        pending.extend(_children(current))
+    return total
+
+
+class RssSampler(threading.Thread):
+    """后台定时采样进程树内存，记录峰值"""
+
+    def __init__(self, interval=0.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_kb = self.main_peak_kb = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak_kb = max(self.peak_kb, tree_rss_kb())
+            self.main_peak_kb = max(self.main_peak_kb, _process_rss_kb(os.getpid()))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return float('nan')
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def make_upload(rows, seed):
+    from benchmark import make_sample_frame
+    buffer = io.BytesIO()
+    make_sample_frame(rows, seed).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def run_session(index, data, issue, date_str, timeout):
+    """一个会话：上传、预览、填写期数日期、生成；返回各阶段耗时和错误"""
+    from streamlit.testing.v1 import AppTest
+
+    result = {'session': index, 'bytes': len(data), 'error': None}
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state[UPLOAD_KEY] = SyntheticUpload(data, f'第{issue}期-{index}.xlsx')
+    try:
+        start = time.perf_counter()
+        at.run()
+        result['upload_seconds'] = time.perf_counter() - start
+        if at.exception or at.error:
+            raise RuntimeError(_messages(at))
+
+        at.text_input[0].input(issue)
+        at.text_input[1].input(date_str)
+        next(button for button in at.button if button.label == '生成周报').click()
+        start = time.perf_counter()
+        at.run()
+        result['generate_seconds'] = time.perf_counter() - start
+        if at.exception or at.error:
+            raise RuntimeError(_messages(at))
+        downloads = at.get('download_button')
+        if len(downloads) != 2:
+            raise RuntimeError(f'下载按钮数量为{len(downloads)}，应为2')
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def _messages(at):
+    return '；'.join([str(e.value) for e in at.error] + [str(e.value) for e in at.exception])
+
+
+def _dir_entries(path):
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        entries.extend(os.path.join(dirpath, name) for name in dirnames + filenames)
+    return entries
+
+
+def run_load_test(sessions, concurrency, rows, same_file=False, warmup=True, timeout=600):
+    """执行压测，返回统计结果字典"""
+    work_dir = tempfile.mkdtemp(prefix='weekly-report-load-')
+    tmp_dir = os.path.join(work_dir, 'tmp')
+    os.makedirs(tmp_dir)
+    # 临时文件和生成结果缓存都放在独立目录，生成进程启动前设置，子进程一并继承
+    os.environ['TMPDIR'] = tmp_dir
+    tempfile.tempdir = None
+    from config import CACHE_CONFIG
+    CACHE_CONFIG['dir'] = os.path.join(work_dir, 'cache')
+
+    restore = _patch_streamlit()
+    sampler = RssSampler()
+    try:
+        uploads = [make_upload(rows[i % len(rows)], 0 if same_file else i) for i in range(sessions)]
+        if warmup:
+            # 预热：首个会话会创建生成进程池，不计入统计
+            warm = run_session(-1, make_upload(rows[0], 10 ** 6), '0', '2000年1月1日', timeout)
+            if warm['error']:
+                raise RuntimeError(f"预热会话失败：{warm['error']}")
+        baseline_tmp = set(_dir_entries(tmp_dir))
+
+        sampler.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(
+                lambda i: run_session(i, uploads[i], '1' if same_file else str(i + 1), '2025年5月20日', timeout),
+                range(sessions)))
+        wall = time.perf_counter() - start
+        sampler.stop()
+
+        leaked = [path for path in _dir_entries(tmp_dir) if path not in baseline_tmp]
+        ok = [r for r in results if not r['error']]
+        latencies = [r['generate_seconds'] for r in ok]
+        uploads_seconds = [r['upload_seconds'] for r in ok]
+        return {
+            'sessions': sessions,
+            'concurrency': concurrency,
+            'rows': rows,
+            'ok': len(ok),
+            'errors': [(r['session'], r['error']) for r in results if r['error']],
+            'wall_seconds': wall,
+            'throughput_per_minute': len(ok) / wall * 60,
+            'upload_p50': percentile(uploads_seconds, 0.5),
+            'generate_p50': percentile(latencies, 0.5),
+            'generate_p95': percentile(latencies, 0.95),
+            'generate_p99': percentile(latencies, 0.99),
+            'peak_rss_mb': sampler.peak_kb / 1024,
+            'main_peak_rss_mb': sampler.main_peak_kb / 1024,
+            'leaked_files': leaked,
+        }
+    finally:
+        if sampler.is_alive():
+            sampler.stop()
+        restore()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='网页端并发压测')
+    parser.add_argument('--sessions', type=int, default=30, help='会话总数')
+    parser.add_argument('--concurrency', type=int, default=10, help='同时进行的会话数')
+    parser.add_argument('--rows', type=int, nargs='+', default=[50, 400, 2000], help='上传文件的行数，按会话轮流使用')
+    parser.add_argument('--same-file', action='store_true', help='所有会话上传同一个文件并填写相同期数日期（测试合并生成和缓存命中）')
+    parser.add_argument('--no-warmup', action='store_true', help='不预热，首个会话承担进程池启动')
+    parser.add_argument('--timeout', type=float, default=600, help='单次脚本运行的超时秒数')
+    args = parser.parse_args()
+
+    # 不通过streamlit run启动时streamlit会打印提示，压测中忽略
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+    stats = run_load_test(args.sessions, args.concurrency, args.rows, args.same_file,
+                          not args.no_warmup, args.timeout)
+    print(f"会话 {stats['sessions']}（并发{stats['concurrency']}，行数{stats['rows']}）："
+          f"成功{stats['ok']}，失败{len(stats['errors'])}")
+    print(f"总耗时 {stats['wall_seconds']:.1f}s，吞吐 {stats['throughput_per_minute']:.1f} 份/分钟")
+    print(f"上传预览 p50 {stats['upload_p50'] * 1000:.0f}ms")
+    print(f"生成 p50 {stats['generate_p50'] * 1000:.0f}ms  p95 {stats['generate_p95'] * 1000:.0f}ms  "
+          f"p99 {stats['generate_p99'] * 1000:.0f}ms")
+    print(f"内存峰值 {stats['peak_rss_mb']:.0f}MB（主进程 {stats['main_peak_rss_mb']:.0f}MB，其余为生成进程）")
+    print(f"残留临时文件 {len(stats['leaked_files'])} 个")
+    for path in stats['leaked_files'][:10]:
+        print(f"  {path}")
+    for session, error in stats['errors'][:10]:
+        print(f"  会话{session}失败：{error}")
+    if stats['errors'] or stats['leaked_files']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
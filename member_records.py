@@ -0,0 +1,267 @@
+"""不依赖pandas的小表读取
+
+十几到几十行的周报，导入pandas、构建DataFrame的耗时超过其余全部工作。这里用openpyxl只读模式
+逐行读取为MemberEntry记录，由WeeklyReportGenerator.load_entries用字典完成分区、分组和去重计数。
+
+单元格按pandas.read_excel的规则转换：整数值的数字转为整数、空单元格和NA字符串视为缺失（NaN）、
+工号整列为数字时转为数字。规则无法确定结果或校验不通过时（取值无效、数值列含文本、
+超出行数上限等）返回None，由调用方改用pandas读取，输出和错误信息与原来完全一致。
+"""
+import math
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+from config import EXCEL_MAPPING, NUMERIC_FIELDS, OPTIONAL_FIELDS, PROJECT_STAGES, WORK_TYPES
+
+# 缺失值，与DataFrame中的NaN一致（写入文字时为nan）
+MISSING = math.nan
+
+# pandas.read_excel默认视为缺失值的字符串
+NA_STRINGS = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                        '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+# pandas读取时整列会被转换为布尔值的字符串
+_BOOL_STRINGS = frozenset(['True', 'TRUE', 'true', 'False', 'FALSE', 'false'])
+
+# 工号整列可安全转为整数的文本
+_DIGITS = re.compile(r'[0-9]{1,15}')
+
+# 工作表XML开头声明的数据范围，如<dimension ref="A1:L201"/>
+_DIMENSION = re.compile(rb'<(?:\w+:)?dimension\s+ref="[A-Z]*(\d+)(?::[A-Z]*(\d+))?"')
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+TEXT_FIELDS = ['name', 'work_type', 'project_name', 'pool_department', 'project_stage']
+TASK_FIELDS = ['last_week_work', 'next_week_plan']
+
+
+class MemberEntry:
+    """周报Excel中的一行：成员在一个项目上的工作，任务已拆分为列表"""
+    __slots__ = ('employee_id', 'name', 'work_type', 'project_name', 'pool_department', 'project_stage',
+                 'last_week_work', 'next_week_plan', 'issues', 'resume_count', 'interview_count',
+                 'interview_pass_count')
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values[field])
+
+    def __repr__(self):
+        return f"MemberEntry({self.name!r}, {self.work_type!r}, {self.project_name!r})"
+
+
+def isna(value):
+    return value is None or value != value
+
+
+def cell_text(value):
+    """单元格的显示文字：空值为空字符串，整数值的小数（工号列有空值时pandas读为小数）按整数显示"""
+    if isna(value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def split_tasks(content):
+    """将工作内容拆分为任务列表，去掉空行"""
+    if isinstance(content, str):
+        return [item.strip() for item in content.split('\n') if item.strip()]
+    elif isinstance(content, list):
+        return [item.strip() for item in content if item.strip()]
+    return []
+
+
+def _convert_cell(cell):
+    """与pandas读取openpyxl单元格的转换一致，缺失值为MISSING"""
+    value = cell.value
+    if value is None or cell.data_type == TYPE_ERROR:
+        return MISSING
+    if cell.data_type == TYPE_NUMERIC and not isinstance(value, bool):
+        integer = int(value)
+        return integer if integer == value else float(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return MISSING
+    return value
+
+
+def _inferable(value):
+    """pandas会把整列转换为数字或布尔值的取值"""
+    if isinstance(value, str):
+        if value in _BOOL_STRINGS:
+            return True
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return isinstance(value, (int, float))
+
+
+def _text_column(values):
+    """文本列：全部为字符串，且不会被整列转换；否则返回None"""
+    present = [value for value in values if not isna(value)]
+    if any(not isinstance(value, str) for value in present):
+        return None
+    if present and all(_inferable(value) for value in present):
+        return None
+    return values
+
+
+def _task_column(values):
+    """工作内容列：非字符串的单元格没有任务，整列会被转换时返回None"""
+    present = [value for value in values if not isna(value)]
+    if present and all(_inferable(value) for value in present):
+        return None
+    return [split_tasks(value) for value in values]
+
+
+def _numeric_column(values):
+    """数值列：只接受整数，缺失为0；含文本、小数或布尔值时返回None"""
+    column = []
+    for value in values:
+        if isna(value):
+            column.append(0)
+        elif isinstance(value, int) and not isinstance(value, bool):
+            column.append(value)
+        else:
+            return None
+    return column
+
+
+def _employee_id_column(values):
+    """工号：整列为数字时pandas转为数字，含缺失值时为小数"""
+    present = [value for value in values if not isna(value)]
+    if not present:
+        return values
+    if all(isinstance(value, str) for value in present) and not all(_inferable(value) for value in present):
+        return values
+    if not all((isinstance(value, int) and not isinstance(value, bool))
+               or (isinstance(value, str) and _DIGITS.fullmatch(value)) for value in present):
+        return None
+    cast = float if len(present) < len(values) else int
+    return [MISSING if isna(value) else cast(int(value)) for value in values]
+
+
+def declared_rows(source, sheet_name=0):
+    """不加载工作簿，从工作表XML开头的<dimension>读取声明的行数（含表头）；无法确定时返回None
+
+    只解压workbook.xml、关系文件和工作表的前4KB，不解析共享字符串，用于在读取前判断是否为小表。
+    声明的范围可能包含末尾的空行，只作为上限使用。
+    """
+    try:
+        with zipfile.ZipFile(source) as archive:
+            workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+            sheets = workbook.findall(f'{_MAIN_NS}sheets/{_MAIN_NS}sheet')
+            if isinstance(sheet_name, int):
+                sheet = sheets[sheet_name]
+            else:
+                sheet = next(item for item in sheets if item.get('name') == sheet_name)
+            rels = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+            target = next(rel.get('Target') for rel in rels.findall(f'{_PKG_REL_NS}Relationship')
+                          if rel.get('Id') == sheet.get(f'{_REL_NS}id'))
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            with archive.open(path) as f:
+                head = f.read(4096)
+    except Exception:
+        return None
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+    match = _DIMENSION.search(head)
+    if not match:
+        return None
+    first, last = int(match.group(1)), int(match.group(2) or match.group(1))
+    return last - first + 1
+
+
+def _read_rows(source, sheet_name, max_rows):
+    """读取表头和数据行，超出行数上限时返回None"""
+    book = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = book.worksheets[sheet_name] if isinstance(sheet_name, int) else book[sheet_name]
+        sheet.reset_dimensions()
+        rows = []
+        last_row_with_data = -1
+        for cells in sheet.iter_rows():
+            cells = list(cells)
+            # 去掉行尾的空单元格
+            while cells and cells[-1].value is None:
+                cells.pop()
+            row = [_convert_cell(cell) for cell in cells]
+            if row:
+                last_row_with_data = len(rows)
+            rows.append(row)
+            # 第一行为表头
+            if max_rows and last_row_with_data > max_rows:
+                return None
+    finally:
+        book.close()
+    return rows[:last_row_with_data + 1]
+
+
+def read_entries(source, sheet_name=0, max_rows=None):
+    """读取并校验一个工作表，返回MemberEntry列表
+
+    max_rows为数据行数上限，超出、无法确定与pandas结果一致或校验不通过时返回None。
+    工作表声明的范围已超出上限时不打开工作簿，直接返回None，大表不会被读取两次。
+    """
+    if max_rows:
+        rows = declared_rows(source, sheet_name)
+        if rows is not None and rows - 1 > max_rows:
+            return None
+    try:
+        rows = _read_rows(source, sheet_name, max_rows)
+    except Exception:
+        # 如.xls文件或工作表不存在，交由pandas读取并报告错误
+        return None
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+    if not rows:
+        return None
+
+    header = [str(col).strip() for col in rows[0]]
+    width = len(header)
+    data = rows[1:]
+    # 数据比表头宽时pandas会把多出的列作为索引
+    if any(len(row) > width for row in data):
+        return None
+
+    columns = {}
+    for key, col in EXCEL_MAPPING.items():
+        if header.count(col) > 1:
+            return None
+        if col not in header:
+            if key in OPTIONAL_FIELDS:
+                continue
+            return None
+        index = header.index(col)
+        columns[key] = [row[index] if index < len(row) else MISSING for row in data]
+
+    for key in TEXT_FIELDS:
+        columns[key] = _text_column(columns[key])
+    for key in TASK_FIELDS:
+        columns[key] = _task_column(columns[key])
+    for key in NUMERIC_FIELDS:
+        columns[key] = _numeric_column(columns[key])
+    if 'employee_id' in columns:
+        columns['employee_id'] = _employee_id_column(columns['employee_id'])
+    else:
+        columns['employee_id'] = [''] * len(data)
+    if any(column is None for column in columns.values()):
+        return None
+
+    # 取值无效时由pandas读取，给出与原来相同的错误信息
+    if not all(value in WORK_TYPES for value in columns['work_type']):
+        return None
+    if not all(isna(value) or value in PROJECT_STAGES for value in columns['project_stage']):
+        return None
+
+    fields = MemberEntry.__slots__
+    return [MemberEntry(**dict(zip(fields, values))) for values in zip(*(columns[field] for field in fields))]
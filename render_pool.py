@@ -0,0 +1,209 @@
+"""预热的周报生成进程池
+
+工作进程启动时即导入pandas/reportlab/docx、注册字体并构建样式，任务到来时直接生成；
+每个进程处理一定数量的任务后自动替换，避免内存持续增长。
+网页端、桌面端和命令行（批量打包、目录监听）都通过它提交生成任务。
+
+用法：
+    pool = RenderPool()
+    stats = pool.render(excel_bytes, '12', '2025年5月20日', pdf_path='周报.pdf')
+    pool.stats()
+"""
+import io
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from config import RENDER_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 保留最近若干次任务的耗时用于统计
+LATENCY_WINDOW = 200
+
+
+# 预热用的两行数据，覆盖入池、入项两类章节
+_WARMUP_ROWS = {
+    'employee_id': ['001', '002'],
+    'name': ['张三', '李四'],
+    'work_type': ['入池', '入项'],
+    'project_name': ['示例项目', '示例项目'],
+    'pool_department': ['示例部门', None],
+    'project_stage': ['开发迭代中', '已立项进行中'],
+    'last_week_work': ['1. 完成接口开发', '1. 完成需求分析'],
+    'next_week_plan': ['1. 进行单元测试', '1. 编写技术方案'],
+    'issues': ['暂无', '暂无'],
+    'resume_count': [0, 0],
+    'interview_count': [0, 0],
+    'interview_pass_count': [0, 0]
+}
+
+
+def _init_worker():
+    """工作进程初始化：导入依赖、注册字体、构建样式和报头
+
+    另在内存中完整生成一次小报告，读取Excel、排版PDF、保存Word时才加载的模块和模板
+    都在这里完成加载，首个真实任务与热生成耗时一致。
+    """
+    import pandas as pd
+    import weekly_report_generator
+    from config import EXCEL_MAPPING, SHEETS_CONFIG
+    from schema_validator import read_excel_checked
+    # 进程池已按任务并行，工作进程内多工作表依次解析，不再另起进程
+    SHEETS_CONFIG['workers'] = 1
+    weekly_report_generator.register_fonts()
+    # 工作进程只用于生成报告，进程级替换reportlab的宽度计算不影响其他代码
+    weekly_report_generator.install_string_width_cache()
+    weekly_report_generator.get_styles()
+    weekly_report_generator.get_masthead()
+    excel = io.BytesIO()
+    pd.DataFrame({EXCEL_MAPPING[key]: values for key, values in _WARMUP_ROWS.items()}).to_excel(excel, index=False)
+    excel.seek(0)
+    try:
+        weekly_report_generator.generate_reports(excel, '0', '2000年1月1日', pdf_path=io.BytesIO(), docx_path=io.BytesIO())
+        # 预热数据行数少，走的是记录路径；较大的表使用DataFrame路径，另行读取一次
+        excel.seek(0)
+        weekly_report_generator.WeeklyReportGenerator(None, None, '0', '2000年1月1日').load_dataframe(
+            read_excel_checked(excel))
+    except Exception as e:
+        logger.warning(f"生成进程预热失败: {str(e)}")
+
+
+def _ping():
+    return os.getpid()
+
+
+def render_report(source, issue, date_str, pdf_path=None, docx_path=None, sheet_name=0):
+    """在工作进程中生成报告，source为Excel路径或文件内容(bytes)"""
+    from weekly_report_generator import generate_reports
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return generate_reports(source, issue, date_str, pdf_path=pdf_path, docx_path=docx_path, sheet_name=sheet_name)
+
+
+def render_report_rows(rows, issue, date_str, pdf_path=None, docx_path=None):
+    """在工作进程中由已解析的数据行生成报告，不再读取Excel"""
+    from weekly_report_generator import generate_reports_from_rows
+    return generate_reports_from_rows(rows, issue, date_str, pdf_path=pdf_path, docx_path=docx_path)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class RenderPool:
+    """带预热和定期替换的进程池，submit接口与Executor一致"""
+
+    def __init__(self, workers=None, max_tasks_per_child=None, warm=True):
+        self.workers = workers or RENDER_POOL_CONFIG['workers']
+        self.max_tasks_per_child = max_tasks_per_child or RENDER_POOL_CONFIG['max_tasks_per_child']
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             max_tasks_per_child=self.max_tasks_per_child)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._submitted = self._completed = self._failed = 0
+        self._started_at = time.time()
+        if warm:
+            self.warm()
+
+    def warm(self, block=True):
+        """启动全部工作进程；block为True时等待初始化完成，否则在后台预热"""
+        start = time.perf_counter()
+        # 没有空闲进程时每次提交都会启动一个新进程，同时提交workers个任务即可全部启动
+        futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+        if not block:
+            return
+        for future in futures:
+            future.result()
+        logger.info(f"生成进程池已就绪：{self.workers}个进程，耗时{time.perf_counter() - start:.2f}秒")
+
+    def submit(self, fn, *args, **kwargs):
+        """提交任务，返回future，并记录排队加执行的耗时"""
+        start = time.perf_counter()
+        future = self._executor.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._submitted += 1
+        future.add_done_callback(lambda f: self._record(f, time.perf_counter() - start))
+        return future
+
+    def _record(self, future, seconds):
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+                self._latencies.append(seconds)
+
+    def render(self, source, issue, date_str, pdf_path=None, docx_path=None, sheet_name=0):
+        """生成一份报告并等待完成，返回generate_reports的统计信息"""
+        return self.submit(render_report, source, issue, date_str, pdf_path, docx_path, sheet_name).result()
+
+    def render_rows(self, rows, issue, date_str, pdf_path=None, docx_path=None):
+        """由已解析的数据行生成一份报告并等待完成，返回generate_reports_from_rows的统计信息"""
+        return self.submit(render_report_rows, rows, issue, date_str, pdf_path, docx_path).result()
+
+    def stats(self):
+        """任务数量和最近任务的耗时（毫秒）"""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = {
+                'workers': self.workers,
+                'max_tasks_per_child': self.max_tasks_per_child,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'in_flight': self._submitted - self._completed - self._failed,
+                'uptime_seconds': round(time.time() - self._started_at, 1),
+            }
+        if latencies:
+            stats.update(latency_p50_ms=round(_percentile(latencies, 0.5) * 1000, 1),
+                         latency_p95_ms=round(_percentile(latencies, 0.95) * 1000, 1),
+                         latency_max_ms=round(max(latencies) * 1000, 1))
+        return stats
+
+    def _live_workers(self):
+        """存活的工作进程数（读取ProcessPoolExecutor内部的进程表）"""
+        processes = dict(getattr(self._executor, '_processes', None) or {})
+        return sum(1 for process in processes.values() if process.is_alive())
+
+    def health(self, timeout=5.0):
+        """健康检查，返回stats()加上live_workers、status和healthy
+
+        status取值：
+        ok：探测任务在超时时间内完成；
+        busy：全部工作进程都在执行任务且有存活进程，探测任务只会排在其后，不再提交，视为正常；
+        unresponsive：有空闲名额但超时无响应，或没有存活的工作进程；
+        broken：进程池已损坏或已关闭。
+        超时时取消仍在排队的探测任务，不在队列中留下多余任务。
+        """
+        stats = dict(self.stats(), live_workers=self._live_workers())
+        if stats['in_flight'] >= self.workers and stats['live_workers']:
+            return dict(stats, status='busy', healthy=True)
+        try:
+            future = self._executor.submit(_ping)
+        except Exception as e:
+            return dict(stats, status='broken', healthy=False, error=str(e))
+        done, _ = wait([future], timeout=timeout)
+        if not done:
+            future.cancel()
+            # 等待期间可能有新任务占满了全部进程
+            stats = dict(self.stats(), live_workers=self._live_workers())
+            if stats['in_flight'] >= self.workers and stats['live_workers']:
+                return dict(stats, status='busy', healthy=True)
+            return dict(stats, status='unresponsive', healthy=False, error=f'{timeout}秒内无响应')
+        if future.exception() is not None:
+            return dict(stats, status='broken', healthy=False, error=str(future.exception()))
+        return dict(stats, status='ok', healthy=True)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -0,0 +1,132 @@
+"""批量生成周报并打包为ZIP
+
+每份周报生成完成后立即写入ZIP并删除临时文件，不会同时在内存中保留全部产物；
+ZIP末尾附带manifest.json，记录每份周报的期数、日期、行数和耗时。
+
+用法：
+    python report_bundle.py -o 周报.zip --job 第12期.xlsx 12 2025年5月20日 --job 第13期.xlsx 13 2025年5月27日
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import as_completed
+
+from artifact_cache import ArtifactCache
+from render_pool import RenderPool
+from weekly_report_generator import generate_reports
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def report_basename(issue, date_str):
+    """包内文件名（不含扩展名）"""
+    return f"产品研发部-综合业务组周报汇总-第{issue}期-{date_str}"
+
+
+def render_job(source, issue, date_str, formats, work_dir, use_cache=True):
+    """生成一份周报到临时目录，返回(产物路径字典, 统计信息)；可在工作进程中执行"""
+    job_dir = tempfile.mkdtemp(dir=work_dir)
+    paths = {fmt: os.path.join(job_dir, f'report.{fmt}') for fmt in formats}
+    if use_cache:
+        stats = ArtifactCache().render_to(source, issue, date_str, paths)
+    else:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        stats = generate_reports(source, issue, date_str, pdf_path=paths.get('pdf'), docx_path=paths.get('docx'))
+    return paths, stats
+
+
+def write_bundle(jobs, target, formats=('pdf', 'docx'), executor=None, use_cache=True):
+    """生成多份周报写入一个ZIP
+
+    jobs为(name, source, issue, date_str)的列表，source为Excel路径或文件内容(bytes)；
+    target为ZIP路径或可写文件对象。executor为RenderPool或其他Executor，为空时依次在当前进程生成。
+    use_cache为True时使用生成结果缓存。
+    返回manifest列表。
+    """
+    manifest = []
+    used_names = set()
+    with tempfile.TemporaryDirectory() as work_dir, \
+            zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+
+        def add_entry(job, paths=None, stats=None, error=None):
+            name, _, issue, date_str = job
+            entry = {'source': name, 'issue': issue, 'date': date_str}
+            if error is not None:
+                logger.error(f"生成 {name} 失败: {error}")
+                entry.update(status='error', error=error)
+            else:
+                base = report_basename(issue, date_str)
+                if base in used_names:
+                    base = f"{base}-{os.path.splitext(name)[0]}"
+                used_names.add(base)
+                entry.update(status='ok', files=[], **stats)
+                for fmt, path in paths.items():
+                    info = zipfile.ZipInfo(f"{base}.{fmt}", date_time=time.localtime()[:6])
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    # 逐块写入ZIP，写完即删除临时文件
+                    with open(path, 'rb') as src, bundle.open(info, 'w') as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    os.unlink(path)
+                    entry['files'].append(info.filename)
+            manifest.append(entry)
+
+        if executor is None:
+            for job in jobs:
+                _, source, issue, date_str = job
+                try:
+                    paths, stats = render_job(source, issue, date_str, formats, work_dir, use_cache)
+                except Exception as e:
+                    add_entry(job, error=str(e))
+                else:
+                    add_entry(job, paths, stats)
+        else:
+            futures = {executor.submit(render_job, source, issue, date_str, formats, work_dir, use_cache): (name, source, issue, date_str)
+                       for name, source, issue, date_str in jobs}
+            # 按完成顺序写入
+            for future in as_completed(futures):
+                job = futures.pop(future)
+                try:
+                    paths, stats = future.result()
+                except Exception as e:
+                    add_entry(job, error=str(e))
+                else:
+                    add_entry(job, paths, stats)
+
+        bundle.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量生成周报并打包为ZIP')
+    parser.add_argument('-o', '--output', required=True, help='输出ZIP路径')
+    parser.add_argument('--job', nargs=3, action='append', required=True, metavar=('EXCEL', 'ISSUE', 'DATE'),
+                        help='Excel路径、期数、日期，可重复指定')
+    parser.add_argument('--formats', nargs='+', choices=['pdf', 'docx'], default=['pdf', 'docx'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='工作进程数，1为不使用进程池')
+    parser.add_argument('--no-cache', action='store_true', help='不使用生成结果缓存')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    jobs = [(os.path.basename(path), os.path.abspath(path), issue, date_str) for path, issue, date_str in args.job]
+    if args.workers > 1:
+        with RenderPool(workers=args.workers) as executor:
+            manifest = write_bundle(jobs, args.output, args.formats, executor, not args.no_cache)
+    else:
+        manifest = write_bundle(jobs, args.output, args.formats, use_cache=not args.no_cache)
+    failed = [entry for entry in manifest if entry['status'] != 'ok']
+    logger.info(f"已生成 {len(manifest) - len(failed)} 份周报：{args.output}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import html
+import re
+
+from weekly_report_generator import MASTHEAD_DEPARTMENT, MASTHEAD_TITLES, WeeklyReportGenerator
+
+_MD_SPECIAL = re.compile(r'([\\`*_{}\[\]<>#+\-!|])')
+
+
+def _escape_md(text):
+    """转义Markdown特殊字符，避免任务内容被当作格式"""
+    return _MD_SPECIAL.sub(r'\\\1', str(text))
+
+
+def render_markdown(generator):
+    """将已加载数据的生成器渲染为Markdown"""
+    lines = [f"## {title}" for title in MASTHEAD_TITLES]
+    lines.append(f"**{_escape_md(generator.issue_text)}**")
+    lines.append(f"{MASTHEAD_DEPARTMENT} &emsp;&emsp; {_escape_md(generator.date_str)}")
+    lines.append("---")
+    for kind, value in generator.iter_blocks():
+        if kind == 'spacer':
+            continue
+        text = _escape_md(value)
+        if kind == 'heading1':
+            lines.append(f"### {text}")
+        elif kind in ('bold', 'project'):
+            lines.append(f"**{text}**")
+        elif kind == 'content':
+            lines.append(f"&emsp;&emsp;{text}")
+        else:
+            lines.append(f"&emsp;{text}")
+    return '\n\n'.join(lines)
+
+
+def render_html(generator):
+    """将已加载数据的生成器渲染为HTML片段"""
+    parts = ['<div class="weekly-report-preview" style="font-family: SimSun, STSong, serif; line-height: 1.6;">']
+    for title in MASTHEAD_TITLES:
+        parts.append(f'<h2 style="color: #e61919; text-align: center; margin: 0.2em 0;">{title}</h2>')
+    parts.append(f'<p style="text-align: center; font-size: 1.3em;">{html.escape(generator.issue_text)}</p>')
+    parts.append('<p style="display: flex; justify-content: space-around; font-size: 1.2em;">'
+                 f'<span>{MASTHEAD_DEPARTMENT}</span><span>{html.escape(generator.date_str)}</span></p>')
+    parts.append('<hr style="border: none; border-top: 2px solid #000;">')
+    for kind, value in generator.iter_blocks():
+        if kind == 'spacer':
+            parts.append(f'<div style="height: {value}px;"></div>')
+            continue
+        text = html.escape(str(value))
+        if kind == 'heading1':
+            parts.append(f'<h3 style="margin: 0.6em 0 0.3em;">{text}</h3>')
+        elif kind in ('bold', 'project'):
+            parts.append(f'<p style="font-weight: bold; margin: 0.2em 0;">{text}</p>')
+        elif kind == 'content':
+            parts.append(f'<p style="text-indent: 2em; margin: 0.2em 0;">{text}</p>')
+        else:
+            parts.append(f'<p style="padding-left: 1em; margin: 0.1em 0;">{text}</p>')
+    parts.append('</div>')
+    return '\n'.join(parts)
+
+
+def preview_report(df, issue, date_str, fmt='html'):
+    """直接由DataFrame生成预览，不生成PDF/Word
+
+    df为{工作表名: DataFrame}时多个工作表合并为一份报告。
+    """
+    generator = WeeklyReportGenerator(None, None, issue, date_str)
+    if isinstance(df, dict):
+        generator.load_sheets(df)
+    else:
+        generator.load_dataframe(df)
+    return render_html(generator) if fmt == 'html' else render_markdown(generator)
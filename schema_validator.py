@@ -0,0 +1,184 @@
+"""周报Excel的表头和取值校验
+
+pandas在各函数内导入：小表走member_records的记录路径时，导入本模块不会加载pandas。
+"""
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from config import EXCEL_MAPPING, OPTIONAL_FIELDS, NUMERIC_FIELDS, COLUMN_ALIASES, PROJECT_STAGES, WORK_TYPES, SHEETS_CONFIG
+
+# sheet_name取该值时读取全部工作表（与pandas相同用None，不会与名为“all”等的工作表混淆，也可在进程间传递）
+ALL_SHEETS = None
+
+
+class ExcelSchemaError(ValueError):
+    """Excel内容不符合模板要求，errors中列出全部问题"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__('；'.join(self.errors))
+
+    def __reduce__(self):
+        # 在进程池中传递时保留错误列表
+        return self.__class__, (self.errors,)
+
+
+def _rewind(source):
+    # 上传的文件对象需要回到开头，才能再次读取
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _format_rows(index, limit=10):
+    """将DataFrame行索引转换为Excel行号（表头占第1行）"""
+    rows = [str(i + 2) for i in index[:limit]]
+    if len(index) > limit:
+        rows.append(f'等{len(index)}行')
+    return '、'.join(rows)
+
+
+def required_columns():
+    """必需字段列表"""
+    return [col for key, col in EXCEL_MAPPING.items() if key not in OPTIONAL_FIELDS]
+
+
+def validate_header(source, sheet_name=0):
+    """只读取表头检查字段，返回列名列表"""
+    import pandas as pd
+    header = pd.read_excel(source, sheet_name=sheet_name, nrows=0)
+    _rewind(source)
+    columns = [str(col).strip() for col in header.columns]
+    errors = []
+    for col in required_columns():
+        if col in columns:
+            continue
+        renamed = [old for old, new in COLUMN_ALIASES.items() if new == col and old in columns]
+        if renamed:
+            errors.append(f"字段“{renamed[0]}”已更名为“{col}”")
+        else:
+            errors.append(f"缺少必需字段“{col}”")
+    if errors:
+        raise ExcelSchemaError(errors)
+    return columns
+
+
+def validate_rows(df):
+    """逐列检查取值：工作类型、项目阶段和数值字段，一次报告全部错误"""
+    import pandas as pd
+    errors = []
+
+    work_type = df[EXCEL_MAPPING['work_type']]
+    bad = ~work_type.isin(list(WORK_TYPES))
+    if bad.any():
+        values = '、'.join(work_type[bad].fillna('（空）').astype(str).unique())
+        errors.append(f"第{_format_rows(df.index[bad])}行工作类型无效：{values}，应为{'/'.join(WORK_TYPES)}")
+
+    stage = df[EXCEL_MAPPING['project_stage']]
+    bad = stage.notna() & ~stage.isin(list(PROJECT_STAGES))
+    if bad.any():
+        values = '、'.join(stage[bad].astype(str).unique())
+        errors.append(f"第{_format_rows(df.index[bad])}行项目阶段无效：{values}")
+
+    for key in NUMERIC_FIELDS:
+        col = EXCEL_MAPPING[key]
+        bad = df[col].notna() & pd.to_numeric(df[col], errors='coerce').isna()
+        if bad.any():
+            errors.append(f"第{_format_rows(df.index[bad])}行“{col}”不是数字")
+
+    if errors:
+        raise ExcelSchemaError(errors)
+
+
+def read_excel_checked(source, sheet_name=0):
+    """先校验表头再完整读取，并校验行数据
+
+    source可以是已打开的pd.ExcelFile，否则在这里打开一次，表头和数据从同一个工作簿读取。
+    """
+    import pandas as pd
+    if not isinstance(source, pd.ExcelFile):
+        with pd.ExcelFile(source) as book:
+            df = read_excel_checked(book, sheet_name)
+        _rewind(source)
+        return df
+    validate_header(source, sheet_name)
+    df = pd.read_excel(source, sheet_name=sheet_name)
+    df.columns = [str(col).strip() for col in df.columns]
+    validate_rows(df)
+    for key in NUMERIC_FIELDS:
+        col = EXCEL_MAPPING[key]
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+
+def sheet_key(sheet_name):
+    """sheet_name的无歧义文字表示，用于缓存键：全部工作表、序号、名称和名称列表各不相同"""
+    if isinstance(sheet_name, (list, tuple)):
+        sheet_name = list(sheet_name)
+    return json.dumps(sheet_name, ensure_ascii=False)
+
+
+def sheet_names(source):
+    """工作簿中的工作表名称"""
+    import pandas as pd
+    with pd.ExcelFile(source) as book:
+        names = book.sheet_names
+    _rewind(source)
+    return names
+
+
+def _read_bytes(source):
+    """Excel内容(bytes)，source为路径、bytes或文件对象"""
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, 'read'):
+        _rewind(source)
+        content = source.read()
+        _rewind(source)
+        return content
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def _read_sheet(book, name):
+    """校验读取一个工作表，返回(DataFrame或None, 带工作表名的错误列表)；book为bytes时自行打开"""
+    if isinstance(book, bytes):
+        book = io.BytesIO(book)
+    try:
+        return read_excel_checked(book, name), []
+    except ExcelSchemaError as e:
+        return None, [f"工作表“{name}”：{err}" for err in e.errors]
+
+
+def read_excel_sheets(source, sheet_name=ALL_SHEETS, max_workers=None):
+    """校验读取多个工作表，返回{工作表名: DataFrame}
+
+    sheet_name为ALL_SHEETS时读取全部工作表，也可以是工作表名称列表。
+    各工作表的问题汇总后一次抛出，错误前注明工作表名称。
+    解析是纯Python代码，多线程受GIL限制，因此并行时每个工作表在独立进程中由工作簿内容各自打开解析；
+    工作簿小于SHEETS_CONFIG['min_bytes']或只有一个进程时，在同一个ExcelFile上依次读取。
+    """
+    import pandas as pd
+    content = None
+    with pd.ExcelFile(source) as book:
+        names = book.sheet_names if sheet_name is ALL_SHEETS else list(sheet_name)
+        missing = [name for name in names if name not in book.sheet_names]
+        if missing:
+            raise ExcelSchemaError([f"工作表“{name}”不存在" for name in missing])
+
+        workers = min(len(names), max_workers or SHEETS_CONFIG['workers'])
+        if workers > 1:
+            content = _read_bytes(source)
+            if len(content) < SHEETS_CONFIG['min_bytes']:
+                content = None
+        if content is None:
+            results = [_read_sheet(book, name) for name in names]
+    _rewind(source)
+    if content is not None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_read_sheet, [content] * len(names), names))
+
+    errors = [err for _, sheet_errors in results for err in sheet_errors]
+    if errors:
+        raise ExcelSchemaError(errors)
+    return {name: df for name, (df, _) in zip(names, results)}
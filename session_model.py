@@ -0,0 +1,104 @@
+"""桌面端的会话级解析缓存
+
+选择文件后在后台线程读取并解析一次，解析结果（数据行和内容哈希）保存在内存中，
+表格预览和PDF/Word导出共用。文件的修改时间或大小变化时重新解析。
+导出时把哈希和数据行交给ArtifactCache：缓存命中时不读取文件，未命中时工作进程直接使用数据行生成。
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from member_records import cell_text
+from weekly_report_generator import WeeklyReportGenerator
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_COLUMNS = ['工号', '姓名', '工作类型', '入池部门', '项目名称', '项目阶段', '上周工作', '下周计划',
+                   '问题反馈', '通过简历数量', '面试人员数量', '面试通过人员数量']
+
+
+def file_signature(path):
+    """(绝对路径, 修改时间, 大小)，任一变化即视为文件已修改"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+class ParsedWorkbook:
+    """一个文件解析后的结果：签名、内容哈希和已加载数据的生成器"""
+
+    def __init__(self, signature, digest, generator, seconds):
+        self.signature = signature
+        self.digest = digest
+        self.generator = generator
+        self.seconds = seconds
+
+    @property
+    def rows(self):
+        """可交给ArtifactCache.render和工作进程的数据行（MemberEntry列表或DataFrame）"""
+        generator = self.generator
+        return generator.entries if generator.entries is not None else generator.data
+
+    def preview_rows(self):
+        """按PREVIEW_COLUMNS逐行返回文字，顺序与原表一致；任务去掉开头编号后按行拼接"""
+        generator = self.generator
+        if generator.entries is not None:
+            extras = ((entry.issues, entry.resume_count, entry.interview_count, entry.interview_pass_count)
+                      for entry in generator.entries)
+        else:
+            data = generator.data
+            extras = zip(data['问题反馈'], data['通过简历数量'], data['面试人员数量'], data['面试通过人员数量'])
+        for member, extra in zip(generator.iter_members(), extras):
+            *fields, last_week, next_week = member
+            tasks = ['\n'.join(filter(None, map(generator._remove_leading_number, week)))
+                     for week in (last_week, next_week)]
+            yield [cell_text(value) for value in fields] + tasks + [cell_text(value) for value in extra]
+
+
+def parse_workbook(path, signature=None):
+    """读取一次文件内容，计算哈希并解析第一个工作表；signature为读取前取得的文件签名"""
+    signature = signature or file_signature(path)
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        content = f.read()
+    generator = WeeklyReportGenerator(io.BytesIO(content), None, '', '')
+    generator.load_excel_data()
+    seconds = time.perf_counter() - start
+    logger.info(f"已解析 {os.path.basename(path)}：{generator.row_count}行，耗时{seconds:.3f}秒")
+    return ParsedWorkbook(signature, hashlib.sha256(content).hexdigest(), generator, seconds)
+
+
+class WorkbookSession:
+    """保存最近选择的文件的解析结果，解析在后台线程中进行"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='workbook-parse')
+        self._lock = threading.Lock()
+        self._signature = None
+        self._future = None
+
+    def load(self, path):
+        """开始后台解析（已解析且文件未修改时直接复用），返回结果为ParsedWorkbook的future"""
+        signature = file_signature(path)
+        with self._lock:
+            future = self._future
+            # 上次解析失败时重新解析，文件可能已经修正
+            if signature == self._signature and not (future.done() and future.exception() is not None):
+                return future
+            self._signature = signature
+            self._future = self._executor.submit(parse_workbook, path, signature)
+            return self._future
+
+    def get(self, path):
+        """返回path的解析结果，必要时等待后台解析完成；文件已修改时重新解析"""
+        model = self.load(path).result()
+        if model.signature != file_signature(path):
+            # 解析期间文件又被修改
+            model = self.load(path).result()
+        return model
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
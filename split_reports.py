@@ -0,0 +1,89 @@
+"""按入池部门、入项项目拆分生成子报告
+
+Excel只解析一次，之后每个入池部门、每个入项项目各生成一份PDF/Word，人数、入池部门、
+项目和招聘数据都只统计该范围内的行。子报告可在生成进程池中并行生成，工作进程直接接收
+已解析的数据行，不再重新读取Excel。
+
+用法：
+    python split_reports.py 周报.xlsx -o 子报告 --issue 12 --date 2025年5月20日 --workers 4
+"""
+import argparse
+import logging
+import os
+import time
+
+from render_pool import RenderPool
+from report_bundle import report_basename
+from schema_validator import ALL_SHEETS
+from weekly_report_generator import WeeklyReportGenerator, sheet_output_path
+
+logger = logging.getLogger(__name__)
+
+
+def render_scope(rows, title, issue, date_str, pdf_path=None, docx_path=None):
+    """由一个范围的数据行生成子报告，返回行数和耗时；可在工作进程中执行"""
+    start = time.perf_counter()
+    generator = WeeklyReportGenerator(None, pdf_path, issue, date_str)
+    generator.load_rows(rows, title)
+    if pdf_path:
+        generator.generate_pdf()
+    if docx_path:
+        generator.generate_word(docx_path)
+    return {'rows': generator.row_count, 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def generate_split_reports(excel_path, issue, date_str, output_dir, formats=('pdf', 'docx'), sheet_name=0,
+                           executor=None):
+    """解析一次Excel，每个入池部门、入项项目各生成一份报告到output_dir
+
+    文件名为“周报名-类别-名称.格式”。executor为RenderPool或其他Executor，为空时依次在当前进程生成。
+    返回清单列表，每项含类别、名称、文件、行数和耗时，顺序与iter_scopes相同。
+    """
+    start = time.perf_counter()
+    generator = WeeklyReportGenerator(excel_path, None, issue, date_str, sheet_name)
+    generator.load_excel_data()
+    logger.info(f"已解析{generator.row_count}行，耗时{time.perf_counter() - start:.2f}秒")
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, report_basename(issue, date_str))
+    jobs = []
+    for kind, name, rows in generator.iter_scopes():
+        files = {fmt: sheet_output_path(f'{base}.{fmt}', f'{kind}-{name}') for fmt in formats}
+        jobs.append(({'scope': kind, 'name': name, 'files': list(files.values())},
+                     (rows, name, issue, date_str, files.get('pdf'), files.get('docx'))))
+
+    if executor is None:
+        results = [render_scope(*args) for _, args in jobs]
+    else:
+        futures = [executor.submit(render_scope, *args) for _, args in jobs]
+        results = [future.result() for future in futures]
+    return [dict(entry, **stats) for (entry, _), stats in zip(jobs, results)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按入池部门、入项项目拆分生成子报告')
+    parser.add_argument('excel_path', help='周报Excel路径')
+    parser.add_argument('-o', '--output-dir', required=True, help='输出目录')
+    parser.add_argument('--issue', default='1', help='期数')
+    parser.add_argument('--date', dest='date_str', default='2024年1月1日', help='日期，如2025年5月20日')
+    parser.add_argument('--formats', nargs='+', choices=['pdf', 'docx'], default=['pdf', 'docx'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='工作进程数，1为不使用进程池')
+    sheets = parser.add_mutually_exclusive_group()
+    sheets.add_argument('--sheet', action='append', help='工作表名称，可重复指定；默认第一个工作表')
+    sheets.add_argument('--all-sheets', action='store_true', help='合并全部工作表后拆分')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sheet_name = ALL_SHEETS if args.all_sheets else (args.sheet or 0)
+    if args.workers > 1:
+        with RenderPool(workers=args.workers) as executor:
+            manifest = generate_split_reports(args.excel_path, args.issue, args.date_str, args.output_dir,
+                                              args.formats, sheet_name, executor)
+    else:
+        manifest = generate_split_reports(args.excel_path, args.issue, args.date_str, args.output_dir,
+                                          args.formats, sheet_name)
+    logger.info(f"已生成 {len(manifest)} 份子报告：{args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
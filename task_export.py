@@ -0,0 +1,150 @@
+"""导出规范化的任务明细
+
+每个成员、项目、周次（上周工作/下周计划）的每条任务一行，任务去掉开头编号，
+供BI工具直接使用，无需再解析原始周报Excel。写出时逐行进行，输出部分的内存占用不随行数增长：
+xlsx使用openpyxl的只写模式，csv逐行写入，Parquet按批写入（需要安装pyarrow）。
+输入的周报仍会完整读入内存。
+
+用法：
+    python task_export.py 周报.xlsx -o 任务明细.xlsx --issue 12 --date 2025年5月20日
+"""
+import argparse
+import csv
+import logging
+import os
+
+from openpyxl import Workbook
+
+from member_records import cell_text
+from schema_validator import ALL_SHEETS
+from weekly_report_generator import WeeklyReportGenerator
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = ['期数', '日期', '分组', '工号', '姓名', '工作类型', '入池部门', '项目名称', '项目阶段',
+                  '周次', '序号', '任务']
+
+FORMATS = ('xlsx', 'csv', 'parquet')
+
+# Parquet每批写入的行数
+PARQUET_BATCH_ROWS = 50000
+
+
+def iter_task_records(generator):
+    """逐条产生任务明细行，顺序与原表一致；generator需已加载数据
+
+    分组为报告中的小节：单个工作表时为综合业务组，多个工作表时为工作表名称。
+    """
+    issue, date_str = cell_text(generator.issue), cell_text(generator.date_str)
+    for title, section in generator.sections:
+        for employee_id, name, work_type, dept, project, stage, last_week, next_week in section.iter_members():
+            member = (issue, date_str, title, cell_text(employee_id), cell_text(name), cell_text(work_type),
+                      cell_text(dept), cell_text(project), cell_text(stage))
+            for week, tasks in (('上周工作', last_week), ('下周计划', next_week)):
+                number = 0
+                for task in tasks:
+                    task = generator._remove_leading_number(task)
+                    if task:
+                        number += 1
+                        yield member + (week, number, task)
+
+
+def write_xlsx(records, path):
+    """只写模式的工作簿逐行写入，返回行数"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('任务明细')
+    sheet.append(EXPORT_COLUMNS)
+    count = 0
+    for record in records:
+        sheet.append(record)
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def write_csv(records, path):
+    """带BOM的UTF-8，Excel直接打开不乱码，返回行数"""
+    count = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    return count
+
+
+def write_parquet(records, path, batch_rows=PARQUET_BATCH_ROWS):
+    """按批写入Parquet，返回行数"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("导出Parquet需要安装pyarrow：pip install pyarrow")
+
+    schema = pa.schema([(col, pa.int32() if col == '序号' else pa.string()) for col in EXPORT_COLUMNS])
+
+    def to_batch(rows):
+        return pa.record_batch([pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                               schema=schema)
+
+    count = 0
+    # 没有任何任务时也会写出只有表结构的文件
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_rows:
+                writer.write_batch(to_batch(batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(to_batch(batch))
+            count += len(batch)
+    return count
+
+
+WRITERS = {'xlsx': write_xlsx, 'csv': write_csv, 'parquet': write_parquet}
+
+
+def export_format(path):
+    """由扩展名判断导出格式"""
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt not in WRITERS:
+        raise ValueError(f"不支持的导出格式：{fmt or '（无扩展名）'}，应为{'/'.join(FORMATS)}")
+    return fmt
+
+
+def export_generator(generator, output_path, fmt=None):
+    """将已加载数据的生成器导出为任务明细，返回行数"""
+    fmt = fmt or export_format(output_path)
+    return WRITERS[fmt](iter_task_records(generator), output_path)
+
+
+def export_tasks(excel_path, output_path, issue='', date_str='', sheet_name=0, fmt=None):
+    """读取周报Excel并导出任务明细，返回行数"""
+    fmt = fmt or export_format(output_path)
+    generator = WeeklyReportGenerator(excel_path, None, issue, date_str, sheet_name)
+    generator.load_excel_data()
+    return export_generator(generator, output_path, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='导出规范化的任务明细（xlsx/csv/parquet）')
+    parser.add_argument('excel_path', help='周报Excel路径')
+    parser.add_argument('-o', '--output', required=True, help='输出路径，格式由扩展名决定')
+    parser.add_argument('--issue', default='', help='期数，写入每一行')
+    parser.add_argument('--date', dest='date_str', default='', help='日期，写入每一行')
+    sheets = parser.add_mutually_exclusive_group()
+    sheets.add_argument('--sheet', action='append', help='工作表名称，可重复指定；默认第一个工作表')
+    sheets.add_argument('--all-sheets', action='store_true', help='导出全部工作表')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sheet_name = ALL_SHEETS if args.all_sheets else (args.sheet or 0)
+    count = export_tasks(args.excel_path, args.output, args.issue, args.date_str, sheet_name)
+    logger.info(f"已导出 {count} 条任务：{args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""历史任务全文检索
+
+每期周报的任务明细（与task_export相同的规范化行，任务已去掉编号）写入本地SQLite，
+用FTS5建立全文索引，回答“上次做X是什么时候、是谁做的”。中文按相邻两字切分（bigram），
+英文和数字按词切分，查询时同样切分后按短语匹配；单个汉字的查询直接在任务文字中查找。
+
+按期数和日期增量写入：同一期重复写入时内容未变化则跳过，内容变化则替换该期的任务。
+
+用法：
+    python task_index.py add 第12期.xlsx --issue 12 --date 2025年5月20日
+    python task_index.py search 接口开发 --name 张三
+    python task_index.py weeks
+"""
+import argparse
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+from config import INDEX_CONFIG
+from schema_validator import ALL_SHEETS, sheet_key
+from task_export import iter_task_records
+from weekly_report_generator import WeeklyReportGenerator
+
+logger = logging.getLogger(__name__)
+
+_CJK = '㐀-䶿一-鿿豈-﫿'
+_TOKEN_RUNS = re.compile(f'([{_CJK}]+)|([0-9A-Za-z]+)')
+_SINGLE_CJK = re.compile(f'[{_CJK}]')
+_DATE = re.compile(r'(\d{4})\s*(?:年|[-/.])\s*(\d{1,2})\s*(?:月|[-/.])\s*(\d{1,2})')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    issue TEXT NOT NULL,
+    date TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    source TEXT,
+    digest TEXT,
+    task_count INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL,
+    UNIQUE (issue, date)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    submission_id INTEGER NOT NULL,
+    section TEXT,
+    employee_id TEXT,
+    name TEXT,
+    work_type TEXT,
+    department TEXT,
+    project TEXT,
+    stage TEXT,
+    week TEXT,
+    number INTEGER,
+    task TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_submission ON tasks (submission_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5 (task, project, tokenize = 'unicode61');
+'''
+
+RESULT_COLUMNS = ['日期', '期数', '姓名', '入池部门', '项目名称', '项目阶段', '周次', '任务']
+
+
+def tokenize(text):
+    """中文连续段切分为相邻两字（单字段保留单字），英文和数字按词并转小写"""
+    tokens = []
+    for cjk, word in _TOKEN_RUNS.findall(str(text)):
+        if cjk:
+            tokens.extend([cjk] if len(cjk) == 1 else [cjk[i:i + 2] for i in range(len(cjk) - 1)])
+        else:
+            tokens.append(word.lower())
+    return tokens
+
+
+def report_date(date_str):
+    """日期文字转为YYYY-MM-DD用于排序，无法识别时为空字符串"""
+    match = _DATE.search(str(date_str))
+    if not match:
+        return ''
+    year, month, day = (int(part) for part in match.groups())
+    return f'{year:04d}-{month:02d}-{day:02d}'
+
+
+def build_query(text):
+    """查询文字转为FTS5表达式和单字条件
+
+    以空白分隔的每个词都需匹配：切分后按短语匹配，最后一个为英文词时按前缀匹配；
+    只有一个汉字的词无法用两字切分检索，返回在like_terms中由调用方直接查找。
+    """
+    phrases, like_terms = [], []
+    for term in text.split():
+        tokens = tokenize(term)
+        if not tokens:
+            continue
+        if len(tokens) == 1 and _SINGLE_CJK.fullmatch(tokens[0]):
+            like_terms.append(tokens[0])
+            continue
+        phrase = '"' + ' '.join(tokens) + '"'
+        if not _SINGLE_CJK.match(tokens[-1]):
+            phrase += '*'
+        phrases.append(phrase)
+    return ' AND '.join(phrases), like_terms
+
+
+class TaskIndex:
+    """任务明细的SQLite全文索引，可被多个进程同时写入"""
+
+    def __init__(self, path=None):
+        self.path = path or INDEX_CONFIG['path']
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return _Connection(conn)
+
+    def add_generator(self, generator, source='', digest=None):
+        """写入已加载数据的生成器中的全部任务，返回写入的任务数；内容未变化时返回0"""
+        issue, date_str = str(generator.issue), str(generator.date_str)
+        records = list(iter_task_records(generator))
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT id, digest FROM submissions WHERE issue = ? AND date = ?',
+                               (issue, date_str)).fetchone()
+            if row and digest and row[1] == digest:
+                conn.execute('ROLLBACK')
+                logger.info(f"第{issue}期（{date_str}）内容未变化，跳过")
+                return 0
+            if row:
+                conn.execute('DELETE FROM tasks_fts WHERE rowid IN (SELECT id FROM tasks WHERE submission_id = ?)',
+                             (row[0],))
+                conn.execute('DELETE FROM tasks WHERE submission_id = ?', (row[0],))
+                conn.execute('DELETE FROM submissions WHERE id = ?', (row[0],))
+            submission_id = conn.execute(
+                'INSERT INTO submissions (issue, date, report_date, source, digest, task_count, indexed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (issue, date_str, report_date(date_str), source, digest, len(records),
+                 datetime.now().isoformat(timespec='seconds'))).lastrowid
+            # 写事务中任务编号连续分配，正文表和索引表使用相同的rowid
+            first_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM tasks').fetchone()[0]
+            conn.executemany(
+                'INSERT INTO tasks (id, submission_id, section, employee_id, name, work_type, department, project, '
+                'stage, week, number, task) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((first_id + i, submission_id) + record[2:] for i, record in enumerate(records)))
+            conn.executemany(
+                'INSERT INTO tasks_fts (rowid, task, project) VALUES (?, ?, ?)',
+                ((first_id + i, ' '.join(tokenize(record[11])), ' '.join(tokenize(record[7])))
+                 for i, record in enumerate(records)))
+            conn.execute('COMMIT')
+        logger.info(f"已索引第{issue}期（{date_str}）{len(records)}条任务")
+        return len(records)
+
+    def add_excel(self, excel_path, issue, date_str, sheet_name=0):
+        """读取周报Excel并写入索引，返回写入的任务数"""
+        from artifact_cache import input_hash
+        digest = input_hash(excel_path)
+        if sheet_name != 0:
+            digest += '|' + sheet_key(sheet_name)
+        generator = WeeklyReportGenerator(excel_path, None, issue, date_str, sheet_name)
+        generator.load_excel_data()
+        source = excel_path if isinstance(excel_path, str) else getattr(excel_path, 'name', '')
+        return self.add_generator(generator, os.path.basename(source), digest)
+
+    def search(self, text, name=None, limit=50):
+        """按关键词查找任务，最近的在前，返回RESULT_COLUMNS顺序的元组列表"""
+        match, like_terms = build_query(text)
+        if not match and not like_terms:
+            return []
+        conditions, params = [], []
+        if match:
+            conditions.append('t.id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)')
+            params.append(match)
+        for term in like_terms:
+            conditions.append("(t.task LIKE ? OR t.project LIKE ?)")
+            params.extend([f'%{term}%'] * 2)
+        if name:
+            conditions.append('t.name = ?')
+            params.append(name)
+        sql = ('SELECT s.date, s.issue, t.name, t.department, t.project, t.stage, t.week, t.task '
+               'FROM tasks t JOIN submissions s ON s.id = t.submission_id '
+               f"WHERE {' AND '.join(conditions)} "
+               'ORDER BY s.report_date DESC, CAST(s.issue AS INTEGER) DESC, t.id LIMIT ?')
+        with self._connect() as conn:
+            return conn.execute(sql, params + [limit]).fetchall()
+
+    def weeks(self):
+        """已索引的各期：(期数, 日期, 任务数, 来源, 索引时间)，最近的在前"""
+        with self._connect() as conn:
+            return conn.execute('SELECT issue, date, task_count, source, indexed_at FROM submissions '
+                                'ORDER BY report_date DESC, CAST(issue AS INTEGER) DESC').fetchall()
+
+
+class _Connection:
+    """用完即关闭的连接（sqlite3连接自身的with只管理事务，不会关闭）"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None and self.conn.in_transaction:
+            self.conn.execute('ROLLBACK')
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='历史任务全文检索')
+    parser.add_argument('--db', help='索引文件路径，默认见config.INDEX_CONFIG')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('add', help='写入一期周报')
+    p.add_argument('excel_path', help='周报Excel路径')
+    p.add_argument('--issue', required=True, help='期数')
+    p.add_argument('--date', dest='date_str', required=True, help='日期，如2025年5月20日')
+    sheets = p.add_mutually_exclusive_group()
+    sheets.add_argument('--sheet', action='append', help='工作表名称，可重复指定；默认第一个工作表')
+    sheets.add_argument('--all-sheets', action='store_true', help='写入全部工作表')
+
+    p = sub.add_parser('search', help='按关键词查找任务')
+    p.add_argument('query', nargs='+', help='关键词，多个词需同时匹配')
+    p.add_argument('--name', help='只看某人的任务')
+    p.add_argument('--limit', type=int, default=50)
+
+    sub.add_parser('weeks', help='列出已索引的各期')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    index = TaskIndex(args.db)
+    if args.command == 'add':
+        sheet_name = ALL_SHEETS if args.all_sheets else (args.sheet or 0)
+        index.add_excel(args.excel_path, args.issue, args.date_str, sheet_name)
+    elif args.command == 'search':
+        rows = index.search(' '.join(args.query), args.name, args.limit)
+        for row in rows:
+            print('  '.join(str(value) for value in row))
+        logger.info(f"共{len(rows)}条")
+    else:
+        for issue, date_str, count, source, indexed_at in index.weeks():
+            print(f"第{issue}期  {date_str}  {count}条  {source}  {indexed_at}")
+
+
+if __name__ == '__main__':
+    main()
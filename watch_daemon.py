@@ -0,0 +1,243 @@
+"""监听目录，自动生成周报
+
+将企微导出的周报Excel放入监听目录，停止写入一段时间后自动生成PDF/Word，
+结果与状态清单manifest.json一起写入输出目录。内容未变化的文件不会重复生成。
+指定--index时，生成成功后同时写入历史任务索引（见task_index.py）。
+
+用法：
+    python watch_daemon.py 监听目录 [--output-dir 输出目录] [--issue 期数] [--date 日期] [--index [索引路径]]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from config import INDEX_CONFIG
+from render_pool import RenderPool
+from task_index import TaskIndex
+from weekly_report_generator import generate_reports
+
+logger = logging.getLogger(__name__)
+
+EXCEL_SUFFIXES = ('.xlsx', '.xls')
+MANIFEST_NAME = 'manifest.json'
+
+
+def file_hash(path):
+    """文件内容的sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_excel(path):
+    name = os.path.basename(path)
+    # 忽略Office打开文件时产生的临时文件
+    return name.lower().endswith(EXCEL_SUFFIXES) and not name.startswith(('~$', '.'))
+
+
+def render_excel(excel_path, output_dir, issue, date_str, index_path=None):
+    """生成一个Excel对应的PDF和Word，index_path不为空时写入历史任务索引；在工作进程中执行"""
+    stem = os.path.splitext(os.path.basename(excel_path))[0]
+    pdf_path = os.path.join(output_dir, f'{stem}.pdf')
+    docx_path = os.path.join(output_dir, f'{stem}.docx')
+    start = time.perf_counter()
+    stats = generate_reports(excel_path, issue, date_str, pdf_path=pdf_path, docx_path=docx_path)
+    if index_path:
+        stats['indexed'] = TaskIndex(index_path).add_excel(excel_path, issue, date_str)
+    return dict(stats, pdf=os.path.basename(pdf_path), docx=os.path.basename(docx_path),
+                seconds=round(time.perf_counter() - start, 3))
+
+
+class WatchDaemon(FileSystemEventHandler):
+    """监听目录中的Excel变化，防抖后提交到进程池生成报告"""
+
+    def __init__(self, watch_dir, output_dir=None, issue=None, date_str=None, workers=2, debounce=2.0,
+                 index_path=None):
+        super().__init__()
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = os.path.abspath(output_dir or os.path.join(watch_dir, 'reports'))
+        self.issue = issue
+        self.date_str = date_str
+        self.debounce = debounce
+        self.index_path = index_path
+        # 工作进程预热后再开始监听，首个文件无需等待导入和字体初始化
+        self.executor = RenderPool(workers=workers)
+        self.manifest_path = os.path.join(self.output_dir, MANIFEST_NAME)
+        self.manifest = {}
+        self._timers = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._load_manifest()
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except Exception as e:
+                logger.error(f"读取状态清单失败: {str(e)}")
+
+    def _save_manifest(self):
+        # 先写临时文件再替换，避免读取方看到不完整的清单
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _update_manifest(self, name, **fields):
+        with self._lock:
+            entry = self.manifest.setdefault(name, {})
+            entry.update(fields, updated_at=datetime.now().isoformat(timespec='seconds'))
+            self._save_manifest()
+
+    def _report_params(self, path):
+        """期数取自文件名中的“第N期”，否则使用--issue；日期默认取文件修改日期"""
+        match = re.search(r'第\s*(\d+)\s*期', os.path.basename(path))
+        issue = match.group(1) if match else self.issue
+        if self.date_str:
+            date_str = self.date_str
+        else:
+            mtime = datetime.fromtimestamp(os.path.getmtime(path))
+            date_str = f'{mtime.year}年{mtime.month}月{mtime.day}日'
+        return issue, date_str
+
+    # watchdog事件
+    def on_created(self, event):
+        if not event.is_directory:
+            self.schedule(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.schedule(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.schedule(event.dest_path)
+
+    def schedule(self, path):
+        """防抖：同一文件在debounce秒内的多次保存只处理一次"""
+        if not is_excel(path) or os.path.dirname(os.path.abspath(path)) != self.watch_dir:
+            return
+        with self._lock:
+            timer = self._timers.pop(path, None)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(self.debounce, self._submit, args=(path,))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _submit(self, path):
+        with self._lock:
+            self._timers.pop(path, None)
+            busy = path in self._running
+            if not busy:
+                self._running.add(path)
+        if busy:
+            # 正在生成，稍后按最新内容再处理
+            self.schedule(path)
+            return
+
+        name = os.path.basename(path)
+        try:
+            future = self._start(path)
+        except Exception as e:
+            logger.error(f"提交 {name} 失败: {str(e)}")
+            self._update_manifest(name, status='error', error=str(e))
+            future = None
+        if future is None:
+            self._release(path)
+        else:
+            future.add_done_callback(lambda f: self._on_done(path, f))
+
+    def _start(self, path):
+        """内容有变化时提交生成任务，返回future；无需生成时返回None"""
+        name = os.path.basename(path)
+        if not os.path.exists(path):
+            return None
+        digest = file_hash(path)
+        entry = self.manifest.get(name, {})
+        if entry.get('hash') == digest and entry.get('status') == 'ok' and all(
+                os.path.exists(os.path.join(self.output_dir, entry[key])) for key in ('pdf', 'docx')):
+            logger.info(f"{name} 内容未变化，跳过")
+            return None
+        issue, date_str = self._report_params(path)
+        if not issue:
+            self._update_manifest(name, hash=digest, status='error',
+                                  error='无法确定期数：文件名需包含“第N期”或使用--issue指定')
+            return None
+        self._update_manifest(name, hash=digest, status='running', issue=issue, date=date_str, error=None)
+        return self.executor.submit(render_excel, path, self.output_dir, issue, date_str, self.index_path)
+
+    def _release(self, path):
+        with self._lock:
+            self._running.discard(path)
+
+    def _on_done(self, path, future):
+        name = os.path.basename(path)
+        try:
+            result = future.result()
+            self._update_manifest(name, status='ok', **result)
+            logger.info(f"{name} 已生成（{result['seconds']}秒）")
+        except Exception as e:
+            logger.error(f"生成 {name} 失败: {str(e)}")
+            self._update_manifest(name, status='error', error=str(e))
+        finally:
+            self._release(path)
+
+    def scan(self):
+        """启动时处理目录中已有的Excel"""
+        for name in sorted(os.listdir(self.watch_dir)):
+            path = os.path.join(self.watch_dir, name)
+            if os.path.isfile(path):
+                self.schedule(path)
+
+    def serve_forever(self):
+        observer = Observer()
+        observer.schedule(self, self.watch_dir, recursive=False)
+        observer.start()
+        self.scan()
+        logger.info(f"正在监听 {self.watch_dir}，输出目录 {self.output_dir}")
+        try:
+            while observer.is_alive():
+                observer.join(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            observer.stop()
+            observer.join()
+            logger.info(f"生成进程统计：{self.executor.stats()}")
+            self.executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='监听目录，自动生成周报PDF/Word')
+    parser.add_argument('watch_dir', help='监听的目录')
+    parser.add_argument('--output-dir', help='输出目录，默认为监听目录下的reports')
+    parser.add_argument('--issue', help='期数（文件名中没有“第N期”时使用）')
+    parser.add_argument('--date', dest='date_str', help='日期，默认取文件修改日期')
+    parser.add_argument('--workers', type=int, default=2, help='工作进程数')
+    parser.add_argument('--debounce', type=float, default=2.0, help='防抖秒数')
+    parser.add_argument('--index', nargs='?', const=INDEX_CONFIG['path'], metavar='PATH',
+                        help='生成后写入历史任务索引，默认路径见config.INDEX_CONFIG')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    WatchDaemon(args.watch_dir, args.output_dir, args.issue, args.date_str,
+                args.workers, args.debounce, args.index).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
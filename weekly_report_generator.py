@@ -1,198 +1,743 @@
-import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.platypus import paragraph as rl_paragraph
+from reportlab.lib import textsplit as rl_textsplit
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfgen import canvas as rl_canvas
 from reportlab.lib.units import inch
 from reportlab.platypus import Table, TableStyle
 from datetime import datetime
+import argparse
+import copy
+import functools
+import itertools
+import io
 import os
 import re
+import threading
+import time
+import zipfile
+from types import MappingProxyType
 from docx import Document
 from docx.shared import Pt, Cm, RGBColor
 from docx.oxml.ns import qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
 import logging
+from config import FAST_PATH_CONFIG
+from member_records import isna, read_entries, split_tasks
+from schema_validator import ALL_SHEETS, read_excel_checked, read_excel_sheets
 
-# 只用内置中文字体，兼容所有平台
-try:
-    pdfmetrics.registerFont(UnicodeCIDFont('STSong-Light'))
-except Exception as e:
-    logging.error(f"注册字体失败: {str(e)}")
-    # 尝试使用其他中文字体
+# 字符串宽度缓存，键为(字体, 字号, 文本, 编码)。任务内容在成员和各期之间大量重复，
+# 缓存后无需每次重新查字体宽度表
+STRING_WIDTH_CACHE_SIZE = 65536
+
+@functools.lru_cache(maxsize=STRING_WIDTH_CACHE_SIZE)
+def _cached_width(font_name, font_size, text, encoding):
+    return pdfmetrics.stringWidth(text, font_name, font_size, encoding)
+
+def cached_string_width(text, fontName, fontSize, encoding='utf8'):
+    """参数与pdfmetrics.stringWidth相同，结果按(字体, 字号, 文本)缓存"""
+    return _cached_width(fontName, fontSize, text, encoding)
+
+def install_string_width_cache():
+    """让reportlab段落换行改用cached_string_width，需显式调用
+
+    副作用：reportlab.platypus.paragraph和reportlab.lib.textsplit按模块全局名称调用stringWidth，
+    这里替换这两个模块属性，对进程内所有使用reportlab的代码生效（包括同一进程中的其他应用），
+    因此只在专用的生成工作进程中调用。换行结果不变；CJK换行逐字测量，缓存的文本通常是单个字符。
+    """
+    rl_paragraph.stringWidth = cached_string_width
+    rl_textsplit.stringWidth = cached_string_width
+
+def uninstall_string_width_cache():
+    """恢复reportlab原来的宽度计算"""
+    rl_paragraph.stringWidth = pdfmetrics.stringWidth
+    rl_textsplit.stringWidth = pdfmetrics.stringWidth
+
+_init_lock = threading.RLock()
+_fonts_registered = False
+_styles = None
+_masthead = None
+
+def register_fonts():
+    """注册中文字体，只执行一次，可在多线程中调用"""
+    global _fonts_registered
+    with _init_lock:
+        if _fonts_registered:
+            return
+        # 只用内置中文字体，兼容所有平台
+        try:
+            pdfmetrics.registerFont(UnicodeCIDFont('STSong-Light'))
+        except Exception as e:
+            logging.error(f"注册字体失败: {str(e)}")
+            # 尝试使用其他中文字体
+            try:
+                pdfmetrics.registerFont(UnicodeCIDFont('SimSun'))
+            except Exception as e:
+                logging.error(f"注册备用字体失败: {str(e)}")
+                # 如果都失败了，使用默认字体
+                logging.warning("使用默认字体")
+        # 画布默认使用Helvetica，提前加载，避免多个线程首次使用时同时注册
+        pdfmetrics.getFont('Helvetica')
+        _fonts_registered = True
+
+register_fonts()
+
+# 正文内容块类型对应的PDF样式
+BLOCK_STYLES = {
+    'heading1': 'ChineseHeading1',
+    'bold': 'ChineseBold',
+    'content': 'ChineseContent',
+    'list': 'ChineseList'
+}
+
+# 渲染版本，输出格式变化时递增，用于生成结果缓存的键
+RENDERER_VERSION = '2'
+
+# Word内ZIP条目的固定时间戳
+DOCX_ZIP_TIMESTAMP = (2000, 1, 1, 0, 0, 0)
+
+# 报头的两行标题和部门，PDF、Word和预览共用
+MASTHEAD_TITLES = ('北银金融科技有限责任公司', '产品研发部综合业务组周例会会议纪要')
+MASTHEAD_DEPARTMENT = '产品研发部'
+
+# 单个工作表时正文小节的标题
+GROUP_TITLE = '综合业务组'
+
+# 转为category的分类字段
+CATEGORY_COLUMNS = ['工作类型', '入池部门', '项目名称', '项目阶段']
+
+# 报告章节分区（排序键）
+PART_INITEM, PART_POOL, PART_OTHER, PART_REST = 0, 1, 2, 3
+
+# 章节内容读取的字段对应的DataFrame列
+ROW_COLUMNS = {
+    'project_name': '项目名称',
+    'project_stage': '项目阶段',
+    'last_week_work': 'last_week_work',
+    'next_week_plan': 'next_week_plan'
+}
+
+
+def _runs(keys, start, stop):
+    """返回keys[start:stop]中取值相同的连续区间(取值, 起点, 终点)"""
+    import numpy as np
+    if start >= stop:
+        return []
+    segment = keys[start:stop]
+    starts = np.flatnonzero(np.r_[True, segment[1:] != segment[:-1]])
+    stops = np.r_[starts[1:], len(segment)]
+    return [(segment[i], start + i, start + j) for i, j in zip(starts, stops)]
+
+class PageCountCanvas(rl_canvas.Canvas):
+    """总页数延迟渲染的画布
+
+    每页页脚只引用同一个表单对象，保存文档时才把总页数写入该表单，
+    因此只需一次排版即可输出“第X页/共N页”。
+    """
+    total_pages_form = 'totalPages'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._page_count = 0
+
+    def showPage(self):
+        self._page_count += 1
+        super().showPage()
+
+    def drawTotalPages(self, x, y, font_name='STSong-Light', font_size=9, suffix='页'):
+        """在(x, y)处放置总页数占位，内容在save时确定"""
+        self._total_pages_font = (font_name, font_size, suffix)
+        self.saveState()
+        self.translate(x, y)
+        self.doForm(self.total_pages_form)
+        self.restoreState()
+
+    def save(self):
+        if self._code:
+            self.showPage()
+        if hasattr(self, '_total_pages_font'):
+            font_name, font_size, suffix = self._total_pages_font
+            self.beginForm(self.total_pages_form, lowerx=0, lowery=-font_size, upperx=font_size * 10, uppery=font_size * 2)
+            self.setFont(font_name, font_size)
+            self.drawString(0, 0, f"{self._page_count}{suffix}")
+            self.endForm()
+        super().save()
+
+
+class LazyStory:
+    """按需从生成器取出flowable的story
+
+    doc.build只会访问story开头的少量元素，这里仅缓存这部分内容，
+    已排版的flowable随即释放，不必一次性构建全部段落。
+
+    len()返回已缓存的数量而不是剩余总数。reportlab处理keepWithNext时只在len()范围内向后查找，
+    因此len()会先缓存开头的整条keepWithNext链及其后一个元素，标题不会与后面的内容分开。
+    """
+
+    def __init__(self, flowables):
+        self._source = iter(flowables)
+        self._buffer = []
+
+    def _fill(self, count):
+        while len(self._buffer) < count:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                break
+
+    def __len__(self):
+        # 至少预取一个，保证还有内容时长度不为0；开头为keepWithNext时缓存到链后的第一个元素
+        self._fill(1)
+        i = 0
+        while i < len(self._buffer) and self._buffer[i].getKeepWithNext():
+            i += 1
+            self._fill(i + 1)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else float('inf'))
+        else:
+            self._fill(index + 1)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else float('inf'))
+        else:
+            self._fill(index + 1)
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
+
+
+def _build_styles():
+    """构建PDF样式表
+
+    中文样式使用CJK换行：按字断行，并避免标点出现在行首。
+    """
+    styles = getSampleStyleSheet()
     try:
-        pdfmetrics.registerFont(UnicodeCIDFont('SimSun'))
+        # 标题：红色、加粗、居中、较大字号
+        styles.add(ParagraphStyle(
+            name='ChineseTitle',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=20,
+            leading=28,
+            alignment=1,  # 居中
+            textColor=colors.red,
+            spaceAfter=10,
+            spaceBefore=10,
+            bold=True
+        ))
+        # 副标题：黑色、居中
+        styles.add(ParagraphStyle(
+            name='ChineseSubtitle',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=14,
+            leading=20,
+            alignment=1,  # 居中
+            textColor=colors.black,
+            spaceAfter=10
+        ))
+        # 一级标题：黑色、加粗、左对齐
+        styles.add(ParagraphStyle(
+            name='ChineseHeading1',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=13,
+            leading=18,
+            alignment=0,  # 左对齐
+            textColor=colors.black,
+            spaceBefore=10,
+            spaceAfter=6,
+            bold=True
+        ))
+        # 加粗样式
+        styles.add(ParagraphStyle(
+            name='ChineseBold',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=11,
+            leading=18,
+            alignment=0,
+            textColor=colors.black,
+            spaceAfter=3,
+            spaceBefore=3,
+            bold=True
+        ))
+        # 正文：黑色、常规、首行缩进
+        styles.add(ParagraphStyle(
+            name='ChineseContent',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=11,
+            leading=18,
+            alignment=0,
+            firstLineIndent=24,
+            textColor=colors.black,
+            spaceAfter=3
+        ))
+        # 列表项：无缩进
+        styles.add(ParagraphStyle(
+            name='ChineseList',
+            fontName='STSong-Light',
+            wordWrap='CJK',
+            fontSize=11,
+            leading=18,
+            alignment=0,
+            leftIndent=12,
+            textColor=colors.black,
+            spaceAfter=2
+        ))
+        styles.add(ParagraphStyle(
+            name='Header',
+            fontName='STSong-Light',
+            fontSize=9,
+            alignment=1
+        ))
+        styles.add(ParagraphStyle(
+            name='Footer',
+            fontName='STSong-Light',
+            fontSize=9,
+            alignment=1
+        ))
     except Exception as e:
-        logging.error(f"注册备用字体失败: {str(e)}")
-        # 如果都失败了，使用默认字体
-        logging.warning("使用默认字体")
+        logging.error(f"设置样式失败: {str(e)}")
+        # 使用默认字体的同名样式，保证各章节仍能渲染
+        styles = getSampleStyleSheet()
+        for name in ('ChineseTitle', 'ChineseSubtitle', 'ChineseHeading1', 'ChineseBold',
+                     'ChineseContent', 'ChineseList', 'Header', 'Footer'):
+            styles.add(ParagraphStyle(name=name, fontSize=11, leading=18))
+    return styles
+
+def get_styles():
+    """返回共享的只读样式表，首次调用时构建"""
+    global _styles
+    if _styles is None:
+        with _init_lock:
+            if _styles is None:
+                register_fonts()
+                sheet = _build_styles()
+                _styles = MappingProxyType({name: sheet[name] for name in sheet.byName})
+    return _styles
+
+class Masthead:
+    """预编译的报头：两行标题、期数、部门日期和分割线
+
+    样式、固定文字的段落和Word的XML片段每个进程只构建一次，各报告共用，
+    每次生成只填入期数和日期。PDF排版会在段落上记录换行结果，因此每次使用段落的浅拷贝。
+    """
+    ISSUE_PLACEHOLDER = '{期数}'
+    DATE_PLACEHOLDER = '{日期}'
+
+    def __init__(self):
+        self.issue_style = ParagraphStyle(name='Issue', fontName='STSong-Light', fontSize=18, alignment=1, spaceAfter=8)
+        self.date_style = ParagraphStyle(name='Date', fontName='STSong-Light', fontSize=16, alignment=1)
+        # 标题（两行，红色大号加粗）
+        self.titles = (
+            Paragraph(MASTHEAD_TITLES[0], ParagraphStyle(
+                name='Title1', fontName='STSong-Light', fontSize=21, leading=36, alignment=1, textColor=colors.red, spaceAfter=6, spaceBefore=12, bold=True
+            )),
+            Paragraph(MASTHEAD_TITLES[1], ParagraphStyle(
+                name='Title2', fontName='STSong-Light', fontSize=21, leading=36, alignment=1, textColor=colors.red, spaceAfter=18, bold=True
+            )),
+        )
+        self.dept = Paragraph(MASTHEAD_DEPARTMENT, ParagraphStyle(name='Dept', fontName='STSong-Light', fontSize=16, alignment=1))
+        self.dept_date_style = TableStyle([
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+            ('TOPPADDING', (0,0), (-1,-1), 6),
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+        ])
+        self.divider_style = TableStyle([
+            ('LINEBELOW', (0,0), (-1,-1), 2, colors.black)
+        ])
+        self.docx_fragment = self._build_docx_fragment()
+
+    def iter_pdf(self, issue_text, date_str, width):
+        """按顺序产生报头的PDF内容"""
+        for title in self.titles:
+            yield copy.copy(title)
+
+        # 期数（居中）
+        yield Paragraph(issue_text, self.issue_style)
+
+        # 部门和日期（两列，居中）
+        dept_date_table = Table(
+            [[copy.copy(self.dept), Paragraph(date_str, self.date_style)]],
+            colWidths=[width/2.0, width/2.0]
+        )
+        dept_date_table.setStyle(self.dept_date_style)
+        yield dept_date_table
+
+        # 分割线
+        yield Spacer(1, 8)
+        yield Table([['']], colWidths=[width], style=self.divider_style)
+        yield Spacer(1, 12)
+
+    def _build_docx_fragment(self):
+        """在空白文档中生成一次报头，保留正文中的XML元素作为模板片段"""
+        doc = Document()
+        # 标题1（红色、加粗、居中、字号21）
+        p = doc.add_paragraph()
+        run = p.add_run(MASTHEAD_TITLES[0])
+        run.font.size = Pt(21)
+        run.bold = True
+        run.font.color.rgb = RGBColor(0xE6, 0x19, 0x19)  # 红色
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p.paragraph_format.space_after = Pt(0)
+        # 标题2（红色、加粗、居中、字号21）
+        p = doc.add_paragraph()
+        run = p.add_run(MASTHEAD_TITLES[1])
+        run.font.size = Pt(21)
+        run.bold = True
+        run.font.color.rgb = RGBColor(0xE6, 0x19, 0x19)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p.paragraph_format.space_after = Pt(8)
+        # 期数（居中，字号18）
+        p = doc.add_paragraph()
+        run = p.add_run(self.ISSUE_PLACEHOLDER)
+        run.font.size = Pt(18)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p.paragraph_format.space_after = Pt(2)
+        # 部门和日期（两列，居中，字号16）
+        table = doc.add_table(rows=1, cols=2)
+        table.alignment = 1  # 居中
+        table.autofit = True
+        table.allow_autofit = True
+        table.columns[0].width = Cm(7)
+        table.columns[1].width = Cm(7)
+        cell1 = table.cell(0, 0)
+        cell2 = table.cell(0, 1)
+        p1 = cell1.paragraphs[0]
+        run1 = p1.add_run(MASTHEAD_DEPARTMENT)
+        run1.font.size = Pt(16)
+        p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p2 = cell2.paragraphs[0]
+        run2 = p2.add_run(self.DATE_PLACEHOLDER)
+        run2.font.size = Pt(16)
+        p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # 分割线（黑色粗线）
+        p = doc.add_paragraph()
+        p.paragraph_format.space_after = Pt(8)
+        p.paragraph_format.space_before = Pt(8)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = p.add_run('')
+        border = OxmlElement('w:pBdr')
+        bottom = OxmlElement('w:bottom')
+        bottom.set(qn('w:val'), 'single')
+        bottom.set(qn('w:sz'), '16')  # 粗线
+        bottom.set(qn('w:color'), '000000')
+        border.append(bottom)
+        p._p.get_or_add_pPr().append(border)
+        return tuple(child for child in doc.element.body if child.tag != qn('w:sectPr'))
+
+    def add_to_docx(self, doc, issue_text, date_str):
+        """将报头片段复制到文档正文末尾，填入期数和日期"""
+        values = {self.ISSUE_PLACEHOLDER: issue_text, self.DATE_PLACEHOLDER: date_str}
+        sect_pr = doc.element.body.sectPr
+        for element in self.docx_fragment:
+            element = copy.deepcopy(element)
+            for run in element.iter(qn('w:r')):
+                if run.text in values:
+                    run.text = values[run.text]
+            sect_pr.addprevious(element)
+
+def get_masthead():
+    """返回共享的预编译报头，首次调用时构建"""
+    global _masthead
+    if _masthead is None:
+        with _init_lock:
+            if _masthead is None:
+                register_fonts()
+                _masthead = Masthead()
+    return _masthead
 
 class WeeklyReportGenerator:
-    def __init__(self, excel_path, output_path, issue, date_str):
+    def __init__(self, excel_path, output_path, issue, date_str, sheet_name=0):
         self.excel_path = excel_path
         self.output_path = output_path
         self.issue = issue
         self.date_str = date_str
+        self.sheet_name = sheet_name
         self.data = None
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
-        
-    def _setup_styles(self):
-        """设置PDF样式"""
-        try:
-            # 标题：红色、加粗、居中、较大字号
-            self.styles.add(ParagraphStyle(
-                name='ChineseTitle',
-                fontName='STSong-Light',
-                fontSize=20,
-                leading=28,
-                alignment=1,  # 居中
-                textColor=colors.red,
-                spaceAfter=10,
-                spaceBefore=10,
-                bold=True
-            ))
-            # 副标题：黑色、居中
-            self.styles.add(ParagraphStyle(
-                name='ChineseSubtitle',
-                fontName='STSong-Light',
-                fontSize=14,
-                leading=20,
-                alignment=1,  # 居中
-                textColor=colors.black,
-                spaceAfter=10
-            ))
-            # 一级标题：黑色、加粗、左对齐
-            self.styles.add(ParagraphStyle(
-                name='ChineseHeading1',
-                fontName='STSong-Light',
-                fontSize=13,
-                leading=18,
-                alignment=0,  # 左对齐
-                textColor=colors.black,
-                spaceBefore=10,
-                spaceAfter=6,
-                bold=True
-            ))
-            # 加粗样式
-            self.styles.add(ParagraphStyle(
-                name='ChineseBold',
-                fontName='STSong-Light',
-                fontSize=11,
-                leading=18,
-                alignment=0,
-                textColor=colors.black,
-                spaceAfter=3,
-                spaceBefore=3,
-                bold=True
-            ))
-            # 正文：黑色、常规、首行缩进
-            self.styles.add(ParagraphStyle(
-                name='ChineseContent',
-                fontName='STSong-Light',
-                fontSize=11,
-                leading=18,
-                alignment=0,
-                firstLineIndent=24,
-                textColor=colors.black,
-                spaceAfter=3
-            ))
-            # 列表项：无缩进
-            self.styles.add(ParagraphStyle(
-                name='ChineseList',
-                fontName='STSong-Light',
-                fontSize=11,
-                leading=18,
-                alignment=0,
-                leftIndent=12,
-                textColor=colors.black,
-                spaceAfter=2
-            ))
-            self.styles.add(ParagraphStyle(
-                name='Header',
-                fontName='STSong-Light',
-                fontSize=9,
-                alignment=1
-            ))
-            self.styles.add(ParagraphStyle(
-                name='Footer',
-                fontName='STSong-Light',
-                fontSize=9,
-                alignment=1
-            ))
-        except Exception as e:
-            logging.error(f"设置样式失败: {str(e)}")
-            # 使用默认样式
-            self.styles.add(ParagraphStyle(
-                name='ChineseTitle',
-                fontSize=20,
-                leading=28,
-                alignment=1,
-                textColor=colors.red,
-                spaceAfter=10,
-                spaceBefore=10,
-                bold=True
-            ))
+        # 记录路径读取的MemberEntry列表，DataFrame路径为None
+        self.entries = None
+        # 字体和样式在进程内只初始化一次，各实例共享且不再修改
+        self.styles = get_styles()
     
     def load_excel_data(self):
-        """加载Excel数据"""
-        self.data = pd.read_excel(self.excel_path)
+        """加载Excel数据，sheet_name为ALL_SHEETS或名称列表时合并多个工作表
+
+        单个工作表且行数不超过FAST_PATH_CONFIG['max_rows']时不使用pandas，直接读取为记录。
+        """
+        if self.sheet_name is ALL_SHEETS or isinstance(self.sheet_name, (list, tuple)):
+            self.load_sheets(read_excel_sheets(self.excel_path, self.sheet_name))
+            return
+        max_rows = FAST_PATH_CONFIG['max_rows']
+        entries = read_entries(self.excel_path, self.sheet_name, max_rows) if max_rows else None
+        if entries is not None:
+            self.load_entries(entries)
+        else:
+            self.load_dataframe(read_excel_checked(self.excel_path, self.sheet_name))
+
+    def load_dataframe(self, df):
+        """使用已读取并校验过的DataFrame"""
+        self.data = df.copy()
+        self.entries = None
         self._preprocess_data()
+        self.sections = [(GROUP_TITLE, self)]
+
+    def load_entries(self, entries):
+        """使用member_records读取的记录，用字典完成与_preprocess_data相同的统计和分区"""
+        self.data = None
+        self.entries = entries
+        self.sections = [(GROUP_TITLE, self)]
+
+        self.recruitment_stats = {
+            'resume': int(sum(entry.resume_count for entry in entries)),
+            'interview': int(sum(entry.interview_count for entry in entries)),
+            'pass': int(sum(entry.interview_pass_count for entry in entries))
+        }
+
+        def present(values):
+            # 去掉缺失值并按首次出现的顺序去重
+            return list(dict.fromkeys(value for value in values if not isna(value)))
+
+        project_names = present(entry.project_name for entry in entries)
+        self.summary = {
+            'total_people': len(present(entry.name for entry in entries)),
+            'pool_people': len(present(entry.name for entry in entries if entry.work_type == '入池')),
+            'pool_departments': present(entry.pool_department for entry in entries),
+            # 排除"其他"
+            'project_names': [name for name in project_names if not self._is_other_project(name)]
+        }
+
+        partitions = {'入项': [], '入池': [], '其他': []}
+        for entry in entries:
+            if not isna(entry.project_name) and self._is_other_project(entry.project_name):
+                partitions['其他'].append(entry)
+            elif entry.work_type in partitions:
+                partitions[entry.work_type].append(entry)
+
+        # 入池按部门、项目排序分组，排序稳定，缺失值排在最前且不成组（与DataFrame路径一致）
+        def sort_key(value):
+            return (0, '') if isna(value) else (1, value)
+
+        pool = sorted(partitions['入池'], key=lambda entry: (sort_key(entry.pool_department),
+                                                            sort_key(entry.project_name)))
+        partitions['入池'] = pool
+        self.partitions = partitions
+        self.pool_groups = []
+        for dept_key, dept_rows in itertools.groupby(pool, key=lambda entry: sort_key(entry.pool_department)):
+            dept_rows = list(dept_rows)
+            if isna(dept_rows[0].pool_department):
+                continue
+            projects = [(rows[0].project_name, rows) for rows in
+                        (list(group) for _, group in itertools.groupby(dept_rows, key=lambda entry: sort_key(entry.project_name)))
+                        if not isna(rows[0].project_name)]
+            dept_people = len(present(entry.name for entry in dept_rows))
+            self.pool_groups.append((dept_rows[0].pool_department, dept_people, projects))
+
+    def load_sheets(self, frames):
+        """多个工作表合并为一份报告：概要按全部数据统计，每个工作表一节
+
+        frames为{工作表名: DataFrame}，只有一个工作表时与load_dataframe相同。
+        """
+        if len(frames) == 1:
+            self.load_dataframe(next(iter(frames.values())))
+            return
+        sections = []
+        for name, df in frames.items():
+            section = WeeklyReportGenerator(None, None, self.issue, self.date_str)
+            section.load_dataframe(df)
+            sections.append((name, section))
+        import pandas as pd
+        self.load_dataframe(pd.concat(list(frames.values()), ignore_index=True))
+        self.sections = sections
     
     def _preprocess_data(self):
-        """数据预处理"""
+        """数据预处理
+
+        分类字段转为category；按报告章节一次排序分区（常规入项、常规入池、其他项目），
+        各章节通过索引切片读取，不再反复按条件筛选复制DataFrame。
+        """
+        import numpy as np
         # 将工作内容和计划拆分为列表
-        def process_content(content):
-            if isinstance(content, str):
-                return [item.strip() for item in content.split('\n') if item.strip()]
-            elif isinstance(content, list):
-                return [item.strip() for item in content if item.strip()]
-            return []
-            
-        self.data['last_week_work'] = self.data['上周三至本周二工作内容'].apply(process_content)
-        self.data['next_week_plan'] = self.data['本周三至下周二工作计划'].apply(process_content)
-        
-        # 按工作类型分组
-        self.grouped_data = {
-            '入池': self.data[self.data['工作类型'] == '入池'],
-            '入项': self.data[self.data['工作类型'] == '入项']
-        }
+        data = self.data
+        data['last_week_work'] = data['上周三至本周二工作内容'].apply(split_tasks)
+        data['next_week_plan'] = data['本周三至下周二工作计划'].apply(split_tasks)
+        for col in CATEGORY_COLUMNS:
+            data[col] = data[col].astype('category')
         
         # 统计招聘数据
         self.recruitment_stats = {
-            'resume': int(self.data['通过简历数量'].sum()),
-            'interview': int(self.data['面试人员数量'].sum()),
-            'pass': int(self.data['面试通过人员数量'].sum())
+            'resume': int(data['通过简历数量'].sum()),
+            'interview': int(data['面试人员数量'].sum()),
+            'pass': int(data['面试通过人员数量'].sum())
         }
 
         # 统计数据
-        total_people = self.data['姓名'].nunique()
-        pool_df = self.data[self.data['工作类型'] == '入池']
-        pool_people = pool_df['姓名'].nunique()
-        pool_departments = self.data['入池部门'].dropna().unique()
-        pool_departments_str = '、'.join(pool_departments)
-        pool_departments_count = len(pool_departments)
-        project_names = self.data['项目名称'].dropna().unique()
-        # 排除"其他"
-        project_names = [name for name in project_names if '其他' not in str(name)]
-        project_names_str = '、'.join(project_names)
-        project_count = len(project_names)
+        work_type = data['工作类型']
+        is_pool = (work_type == '入池').to_numpy()
+        is_initem = (work_type == '入项').to_numpy()
+        project_names = data['项目名称'].dropna().unique()
+        self.summary = {
+            'total_people': data['姓名'].nunique(),
+            'pool_people': data['姓名'][is_pool].nunique(),
+            'pool_departments': list(data['入池部门'].dropna().unique()),
+            # 排除"其他"
+            'project_names': [name for name in project_names if not self._is_other_project(name)]
+        }
+
+        # 项目名称含"其他"的行：按类别判断一次，再按编码映射到各行
+        project_codes = data['项目名称'].cat.codes.to_numpy()
+        other_categories = [self._is_other_project(name) for name in data['项目名称'].cat.categories]
+        is_other = np.append(np.array(other_categories, dtype=bool), False)[project_codes]
+
+        # 一次稳定排序：分区 -> 入池部门 -> 项目名称，分区内保持原有行顺序
+        part = np.full(len(data), PART_REST)
+        part[is_initem & ~is_other] = PART_INITEM
+        part[is_pool & ~is_other] = PART_POOL
+        part[is_other] = PART_OTHER
+        in_pool = part == PART_POOL
+        dept_key = np.where(in_pool, data['入池部门'].cat.codes.to_numpy(), 0)
+        project_key = np.where(in_pool, project_codes, 0)
+        order = np.lexsort((project_key, dept_key, part))
+        self.partitioned = data.iloc[order]
+        bounds = np.searchsorted(part[order], [PART_INITEM, PART_POOL, PART_OTHER, PART_REST])
+        self.partitions = {
+            '入项': slice(bounds[0], bounds[1]),
+            '入池': slice(bounds[1], bounds[2]),
+            '其他': slice(bounds[2], bounds[3])
+        }
+        self.pool_groups = self._group_pool(dept_key[order], project_key[order])
+
+    def _group_pool(self, dept_key, project_key):
+        """常规入池分区内按部门、项目划分连续区间（与groupby一致，跳过空值）"""
+        pool = self.partitions['入池']
+        names = self.partitioned['姓名']
+        departments = self.partitioned['入池部门'].cat.categories
+        projects = self.partitioned['项目名称'].cat.categories
+        groups = []
+        for dept_code, dept_start, dept_stop in _runs(dept_key, pool.start, pool.stop):
+            if dept_code < 0:
+                continue
+            project_slices = [(projects[code], slice(start, stop))
+                              for code, start, stop in _runs(project_key, dept_start, dept_stop) if code >= 0]
+            dept_people = names.iloc[dept_start:dept_stop].nunique()
+            groups.append((departments[dept_code], dept_people, project_slices))
+        return groups
+
+    def load_rows(self, rows, title=GROUP_TITLE):
+        """使用iter_scopes产生的数据行（DataFrame或MemberEntry列表），正文小节标题为title"""
+        if isinstance(rows, list):
+            self.load_entries(rows)
+        else:
+            self.load_dataframe(rows)
+        self.sections = [(title, self)]
+
+    def iter_scopes(self):
+        """子报告范围：每个入池部门、每个入项项目（不含其他项目），按首次出现的顺序
+
+        产生(类别, 名称, 数据行)，数据行只含该部门的入池行或该项目的入项行，
+        与已加载的数据类型相同（DataFrame或MemberEntry列表），可传给load_rows或工作进程。
+        """
+        if self.entries is not None:
+            rows = ((entry.work_type, entry.pool_department, entry.project_name) for entry in self.entries)
+        else:
+            rows = zip(self.data['工作类型'], self.data['入池部门'], self.data['项目名称'])
+        scopes = {}
+        for index, (work_type, dept, project) in enumerate(rows):
+            if work_type == '入池' and not isna(dept):
+                scope = ('入池部门', dept)
+            elif work_type == '入项' and not isna(project) and not self._is_other_project(project):
+                scope = ('入项项目', project)
+            else:
+                continue
+            scopes.setdefault(scope, []).append(index)
+        for (kind, name), indices in scopes.items():
+            if self.entries is not None:
+                yield kind, name, [self.entries[i] for i in indices]
+            else:
+                yield kind, name, self.data.iloc[indices]
+
+    @property
+    def row_count(self):
+        """数据行数"""
+        return len(self.entries) if self.entries is not None else len(self.data)
+
+    def _rows(self, rows, *fields):
+        """逐行返回指定字段的值；rows为DataFrame路径的分区切片或记录路径的MemberEntry列表"""
+        if isinstance(rows, slice):
+            frame = self.partitioned.iloc[rows]
+            return zip(*(frame[ROW_COLUMNS[field]] for field in fields))
+        return ([getattr(entry, field) for field in fields] for entry in rows)
+
+    def _initem_rows(self, field):
+        """常规入项项目，逐行返回(项目名称, 项目阶段, 去编号的任务)"""
+        for name, stage, tasks in self._rows(self.partitions['入项'], 'project_name', 'project_stage', field):
+            tasks = tasks if isinstance(tasks, list) else []
+            yield name, stage, [self._remove_leading_number(task) for task in tasks if task.strip()]
+
+    def _pool_rows(self, field):
+        """常规入池，按部门返回(部门, 人数, [(项目名称, 项目阶段, 去编号的任务)])"""
+        for dept, dept_people, project_slices in self.pool_groups:
+            projects = []
+            for project_name, rows in project_slices:
+                rows = list(self._rows(rows, 'project_stage', field))
+                all_tasks = []
+                for _, tasks in rows:
+                    if isinstance(tasks, list):
+                        all_tasks.extend([self._remove_leading_number(task) for task in tasks if task.strip()])
+                projects.append((project_name, rows[0][0], all_tasks))
+            yield dept, dept_people, projects
+
+    def _other_rows(self, field):
+        """其他项目，逐行返回去编号的任务"""
+        for (tasks,) in self._rows(self.partitions['其他'], field):
+            tasks = tasks if isinstance(tasks, list) else []
+            yield [self._remove_leading_number(task) for task in tasks]
+
+    def iter_members(self):
+        """逐行返回(工号, 姓名, 工作类型, 入池部门, 项目名称, 项目阶段, 上周任务, 下周任务)，顺序与原表一致"""
+        if self.entries is not None:
+            for entry in self.entries:
+                yield (entry.employee_id, entry.name, entry.work_type, entry.pool_department, entry.project_name,
+                       entry.project_stage, entry.last_week_work, entry.next_week_plan)
+            return
+        data = self.data
+        employee_ids = data['工号'] if '工号' in data else [''] * len(data)
+        yield from zip(employee_ids, data['姓名'], data['工作类型'], data['入池部门'], data['项目名称'],
+                       data['项目阶段'], data['last_week_work'], data['next_week_plan'])
 
     def _header_footer(self, canvas, doc):
         """添加页眉页脚"""
         canvas.saveState()
         
         # 页眉
-        header = "北银金融科技有限责任公司产品研发部"
-        canvas.setFont('Helvetica', 9)
+        header = MASTHEAD_TITLES[0] + MASTHEAD_DEPARTMENT
+        canvas.setFont('STSong-Light', 9)
         canvas.drawString(doc.leftMargin, doc.pagesize[1] - 40, header)
         
-        # 页脚
-        footer_text = f"页码：第{doc.page}页/共***页"
+        # 页脚（总页数由PageCountCanvas在保存时填入）
+        footer_text = f"页码：第{doc.page}页/共"
         canvas.drawString(doc.leftMargin, 30, footer_text)
+        canvas.drawTotalPages(doc.leftMargin + pdfmetrics.stringWidth(footer_text, 'STSong-Light', 9), 30)
         canvas.drawString(doc.leftMargin + 300, 30, "内部资料，严禁外传")
         
         canvas.restoreState()
@@ -201,354 +746,197 @@ class WeeklyReportGenerator:
         """去除开头编号（如1.、1)、1、等）"""
         return re.sub(r'^[\d一二三四五六七八九十]+[\.|、|\)|\s]+', '', str(text).strip())
     
-    def generate_pdf(self):
-        """生成PDF报告"""
-        doc = SimpleDocTemplate(
-            self.output_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
-        
-        story = []
-        
-        # 动态统计概要数据
-        total_people = self.data['姓名'].nunique()
-        pool_people = self.grouped_data['入池']['姓名'].nunique()
-        pool_departments = self.data['入池部门'].dropna().unique()
-        pool_departments_str = '、'.join(pool_departments)
-        pool_departments_count = len(pool_departments)
-        project_names = self.data['项目名称'].dropna().unique()
-        # 排除"其他"
-        project_names = [name for name in project_names if '其他' not in str(name)]
-        project_names_str = '、'.join(project_names)
-        project_count = len(project_names)
-
-        # 分类"其他项目"
-        def is_other_project(name):
-            return '其他' in str(name)
-        # 入项、入池分为"常规项目"和"其他项目"
-        regular_initem = self.grouped_data['入项'][~self.grouped_data['入项']['项目名称'].apply(is_other_project)]
-        other_initem = self.grouped_data['入项'][self.grouped_data['入项']['项目名称'].apply(is_other_project)]
-        regular_pool = self.grouped_data['入池'][~self.grouped_data['入池']['项目名称'].apply(is_other_project)]
-        other_pool = self.grouped_data['入池'][self.grouped_data['入池']['项目名称'].apply(is_other_project)]
+    def _is_other_project(self, name):
+        """项目名称含“其他”的归入其他工作"""
+        return '其他' in str(name)
 
-        # 标题（两行，红色大号加粗）
-        title1 = Paragraph("北银金融科技有限责任公司", ParagraphStyle(
-            name='Title1', fontName='STSong-Light', fontSize=21, leading=36, alignment=1, textColor=colors.red, spaceAfter=6, spaceBefore=12, bold=True
-        ))
-        title2 = Paragraph("产品研发部综合业务组周例会会议纪要", ParagraphStyle(
-            name='Title2', fontName='STSong-Light', fontSize=21, leading=36, alignment=1, textColor=colors.red, spaceAfter=18, bold=True
-        ))
-        story.append(title1)
-        story.append(title2)
+    @property
+    def issue_text(self):
+        """期数行文字"""
+        return f"{self.report_year} 年第 {self.issue} 期"
 
-        # 期数（居中）
-        issue_para = Paragraph(f"{datetime.now().year} 年第 {self.issue} 期", ParagraphStyle(
-            name='Issue', fontName='STSong-Light', fontSize=18, alignment=1, spaceAfter=8
-        ))
-        story.append(issue_para)
+    @property
+    def report_year(self):
+        """报告年份取自日期（如2025年5月20日、2025-05-20），无法识别时使用当前年份"""
+        match = re.search(r'(\d{4})\s*(?:年|[-/.])', str(self.date_str))
+        return int(match.group(1)) if match else datetime.now().year
 
-        # 部门和日期（两列，居中）
-        dept_date_table = Table(
-            [[Paragraph("产品研发部", ParagraphStyle(name='Dept', fontName='STSong-Light', fontSize=16, alignment=1)),
-              Paragraph(self.date_str, ParagraphStyle(name='Date', fontName='STSong-Light', fontSize=16, alignment=1))]],
-            colWidths=[doc.width/2.0, doc.width/2.0]
-        )
-        dept_date_table.setStyle(TableStyle([
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-            ('TOPPADDING', (0,0), (-1,-1), 6),
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-        ]))
-        story.append(dept_date_table)
+    def _iter_masthead(self, doc):
+        """报头：标题、期数、部门日期和分割线"""
+        return get_masthead().iter_pdf(self.issue_text, self.date_str, doc.width)
 
-        # 分割线
-        story.append(Spacer(1, 8))
-        story.append(Table([['']], colWidths=[doc.width], style=TableStyle([
-            ('LINEBELOW', (0,0), (-1,-1), 2, colors.black)
-        ])))
-        story.append(Spacer(1, 12))
+    def _iter_project_progress(self, field):
+        """1)项目进展：入项的常规项目"""
+        yield 'bold', "1)项目进展"
+        for project_name, project_stage, tasks in self._initem_rows(field):
+            yield 'project', f"•{project_name}（{project_stage}）"
+            for idx, task in enumerate(tasks, 1):
+                yield 'list', f"{idx}、{task}"
+            yield 'spacer', 4
+
+    def _iter_pool_work(self, field):
+        """2)入池工作：按入池部门、项目汇总"""
+        yield 'bold', "2)入池工作"
+        yield 'content', f"目前组内有{self.summary['total_people']}人，{self.summary['pool_people']}人入池。"
+        for dept, dept_people, projects in self._pool_rows(field):
+            yield 'bold', f"•{dept}（{dept_people}人）"
+            for project_name, project_stage, tasks in projects:
+                yield 'list', f"{project_name}（{project_stage}）"
+                for idx, task in enumerate(tasks, 1):
+                    yield 'list', f"{idx}、{task}"
+            yield 'spacer', 2
+
+    def _iter_other_work(self, field, recruitment_text):
+        """3)其他工作：其他项目及招聘"""
+        yield 'bold', "3)其他工作"
+        for tasks in self._other_rows(field):
+            for task in tasks:
+                if task.strip():
+                    yield 'list', f"•{task}"
+        # 招聘内容合并到3)其他工作
+        yield 'list', recruitment_text
+        yield 'spacer', 4
+        yield 'spacer', 4
+
+    @property
+    def summary_text(self):
+        """当周工作情况的概要段落"""
+        summary = self.summary
+        pool_departments = summary['pool_departments']
+        project_names = summary['project_names']
+        return (f"产品研发部综合业务组共计{summary['total_people']}人，组内有{summary['pool_people']}人入池"
+                f"{'、'.join(pool_departments)}{len(pool_departments)}个部门，支持行内日常工作。"
+                f"组内目前支持{len(project_names)}个项目，包括{'、'.join(project_names)}。")
 
+    @property
+    def recruitment_text(self):
+        """当周招聘情况"""
+        stats = self.recruitment_stats
+        return f"•招聘：简历通过{stats['resume']}份，面试{stats['interview']}人，通过{stats['pass']}人"
+
+    def iter_blocks(self):
+        """按章节依次产生正文内容块(类型, 内容)
+
+        类型为heading1/bold/project/content/list/spacer，PDF与预览共用。
+        """
         # 一、当周工作情况（加粗）
-        story.append(Paragraph("一、当周工作情况", self.styles['ChineseHeading1']))
+        yield 'heading1', "一、当周工作情况"
         # 动态概要段落
-        summary = f"产品研发部综合业务组共计{total_people}人，组内有{pool_people}人入池{pool_departments_str}{pool_departments_count}个部门，支持行内日常工作。组内目前支持{project_count}个项目，包括{project_names_str}。"
-        story.append(Paragraph(summary, self.styles['ChineseContent']))
-        story.append(Paragraph("汇报详情如下：", self.styles['ChineseContent']))
-        story.append(Spacer(1, 6))
-        # 1.综合业务组（加粗）
-        story.append(Paragraph("1.综合业务组", self.styles['ChineseBold']))
-        # 1)项目进展（加粗）
-        story.append(Paragraph("1)项目进展", self.styles['ChineseBold']))
-        if not regular_initem.empty:
-            for _, row in regular_initem.iterrows():
-                project_title = f"<b>•{row['项目名称']}（{row['项目阶段']}）</b>"
-                story.append(Paragraph(project_title, self.styles['ChineseBold']))
-                if isinstance(row['last_week_work'], list):
-                    filtered_tasks = [self._remove_leading_number(task) for task in row['last_week_work'] if task.strip()]
-                    for idx, task in enumerate(filtered_tasks, 1):
-                        story.append(Paragraph(f"{idx}、{task}", self.styles['ChineseList']))
-                story.append(Spacer(1, 4))
-        # 2)入池工作（加粗）
-        story.append(Paragraph("2)入池工作", self.styles['ChineseBold']))
-        story.append(Paragraph(f"目前组内有{total_people}人，{pool_people}人入池。", self.styles['ChineseContent']))
-        # 过滤掉"其他"项目
-        pool_no_other = self.grouped_data['入池'][~self.grouped_data['入池']['项目名称'].apply(is_other_project)]
-        for dept, dept_group in pool_no_other.groupby('入池部门'):
-            dept_people = dept_group['姓名'].nunique()
-            story.append(Paragraph(f"•{dept}（{dept_people}人）", self.styles['ChineseBold']))
-            for project_name, proj_group in dept_group.groupby('项目名称'):
-                project_stage = proj_group.iloc[0]['项目阶段']
-                story.append(Paragraph(f"{project_name}（{project_stage}）", self.styles['ChineseList']))
-                all_tasks = []
-                for _, row in proj_group.iterrows():
-                    if isinstance(row['last_week_work'], list):
-                        all_tasks.extend([self._remove_leading_number(task) for task in row['last_week_work'] if task.strip()])
-                for idx, task in enumerate(all_tasks, 1):
-                    story.append(Paragraph(f"{idx}、{task}", self.styles['ChineseList']))
-            story.append(Spacer(1, 2))
-        # 3)其他工作（加粗）
-        story.append(Paragraph("3)其他工作", self.styles['ChineseBold']))
-        other_projects = self.data[self.data['项目名称'].str.contains('其他', na=False)]
-        if not other_projects.empty:
-            for _, row in other_projects.iterrows():
-                tasks = row['last_week_work'] if isinstance(row['last_week_work'], list) else []
-                for task in tasks:
-                    task = self._remove_leading_number(task)
-                    if task.strip():
-                        story.append(Paragraph(f"•{task}", self.styles['ChineseList']))
-        # 招聘内容合并到3)其他工作
-        recruitment_text = f"•招聘：简历通过{self.recruitment_stats['resume']}份，面试{self.recruitment_stats['interview']}人，通过{self.recruitment_stats['pass']}人"
-        story.append(Paragraph(recruitment_text, self.styles['ChineseList']))
-        story.append(Spacer(1, 4))
-        
-        story.append(Spacer(1, 4))
-        
+        yield 'content', self.summary_text
+        yield 'content', "汇报详情如下："
+        yield 'spacer', 6
+        # 1.综合业务组（加粗），多个工作表时每个工作表一节
+        for number, (title, section) in enumerate(self.sections, 1):
+            yield 'bold', f"{number}.{title}"
+            yield from section._iter_project_progress('last_week_work')
+            yield from section._iter_pool_work('last_week_work')
+            yield from section._iter_other_work('last_week_work', section.recruitment_text)
+
         # 二、下周工作计划（加粗）
-        story.append(Paragraph("二、下周工作计划", self.styles['ChineseHeading1']))
+        yield 'heading1', "二、下周工作计划"
         # 增加指定文案
-        story.append(Paragraph("下一周产品研发部综合业务组将按计划有序推进各项目和部门入池工作，各项工作计划如下：", self.styles['ChineseContent']))
-        story.append(Spacer(1, 6))
+        yield 'content', "下一周产品研发部综合业务组将按计划有序推进各项目和部门入池工作，各项工作计划如下："
+        yield 'spacer', 6
         # 1.综合业务组（加粗）
-        story.append(Paragraph("1.综合业务组", self.styles['ChineseBold']))
-        # 1)项目进展（加粗）
-        story.append(Paragraph("1)项目进展", self.styles['ChineseBold']))
-        if not regular_initem.empty:
-            for _, row in regular_initem.iterrows():
-                project_title = f"<b>•{row['项目名称']}（{row['项目阶段']}）</b>"
-                story.append(Paragraph(project_title, self.styles['ChineseBold']))
-                if isinstance(row['next_week_plan'], list):
-                    filtered_plans = [self._remove_leading_number(task) for task in row['next_week_plan'] if task.strip()]
-                    for idx, task in enumerate(filtered_plans, 1):
-                        story.append(Paragraph(f"{idx}、{task}", self.styles['ChineseList']))
-                story.append(Spacer(1, 4))
-        # 2)入池工作（加粗）
-        story.append(Paragraph("2)入池工作", self.styles['ChineseBold']))
-        story.append(Paragraph(f"目前组内有{total_people}人，{pool_people}人入池。", self.styles['ChineseContent']))
-        # 过滤掉"其他"项目
-        pool_no_other = self.grouped_data['入池'][~self.grouped_data['入池']['项目名称'].apply(is_other_project)]
-        for dept, dept_group in pool_no_other.groupby('入池部门'):
-            dept_people = dept_group['姓名'].nunique()
-            story.append(Paragraph(f"•{dept}（{dept_people}人）", self.styles['ChineseBold']))
-            for project_name, proj_group in dept_group.groupby('项目名称'):
-                project_stage = proj_group.iloc[0]['项目阶段']
-                story.append(Paragraph(f"{project_name}（{project_stage}）", self.styles['ChineseList']))
-                all_tasks = []
-                for _, row in proj_group.iterrows():
-                    if isinstance(row['next_week_plan'], list):
-                        all_tasks.extend([self._remove_leading_number(task) for task in row['next_week_plan'] if task.strip()])
-                for idx, task in enumerate(all_tasks, 1):
-                    story.append(Paragraph(f"{idx}、{task}", self.styles['ChineseList']))
-            story.append(Spacer(1, 2))
-        # 3)其他工作（加粗）
-        story.append(Paragraph("3)其他工作", self.styles['ChineseBold']))
-        other_projects = self.data[self.data['项目名称'].str.contains('其他', na=False)]
-        if not other_projects.empty:
-            for _, row in other_projects.iterrows():
-                plans = row['next_week_plan'] if isinstance(row['next_week_plan'], list) else []
-                for plan in plans:
-                    plan = self._remove_leading_number(plan)
-                    if plan.strip():
-                        story.append(Paragraph(f"•{plan}", self.styles['ChineseList']))
-        # 招聘内容合并到3)其他工作
-        story.append(Paragraph("•招聘：持续招聘工作", self.styles['ChineseList']))
-        story.append(Spacer(1, 4))
+        for number, (title, section) in enumerate(self.sections, 1):
+            yield 'bold', f"{number}.{title}"
+            yield from section._iter_project_progress('next_week_plan')
+            yield from section._iter_pool_work('next_week_plan')
+            yield from section._iter_other_work('next_week_plan', "•招聘：持续招聘工作")
+
+    def _iter_story(self, doc):
+        """按章节依次产生PDF内容"""
+        yield from self._iter_masthead(doc)
+        for kind, value in self.iter_blocks():
+            if kind == 'spacer':
+                yield Spacer(1, value)
+            elif kind == 'project':
+                yield Paragraph(f"<b>{value}</b>", self.styles['ChineseBold'])
+            else:
+                yield Paragraph(value, self.styles[BLOCK_STYLES[kind]])
+
+    def generate_pdf(self, streaming=True):
+        """生成PDF报告
+
+        streaming为True时按章节逐个产生内容供排版使用，不再同时持有全部段落（4000行时story的内存峰值
+        约减半）；但reportlab在canvas.save()之前保留全部页面内容，进程内存仍随页数增长，并非恒定。
+        为False时先构建完整的story列表。
+        """
+        doc = SimpleDocTemplate(
+            self.output_path,
+            pagesize=A4,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72,
+            invariant=1  # 固定创建时间和文档ID，相同输入生成相同字节
+        )
         
-        story.append(Spacer(1, 4))
+        story = self._iter_story(doc)
+        story = LazyStory(story) if streaming else list(story)
         
-        # 生成PDF（无页眉页脚）
-        doc.build(story)
+        # 生成PDF（页眉页脚，单次排版）
+        doc.build(story, onFirstPage=self._header_footer, onLaterPages=self._header_footer,
+                  canvasmaker=PageCountCanvas)
     
-    def run(self):
-        """运行生成器"""
-        self.load_excel_data()
-        self.generate_pdf()
+    def generate_word(self, output_path):
+        """生成Word报告"""
+        doc = Document()
+        style = doc.styles['Normal']
+        style.font.name = '宋体'
+        style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
 
-def generate_word_report(excel_path, output_path, issue, date_str):
-    import pandas as pd
-    import re
-    from docx import Document
-    from docx.shared import Pt, Cm, RGBColor
-    from docx.oxml.ns import qn
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.oxml import OxmlElement
-
-    df = pd.read_excel(excel_path)
-    # 先处理工作内容字段
-    def process_content(content):
-        if isinstance(content, str):
-            return [item.strip() for item in content.split('\n') if item.strip()]
-        elif isinstance(content, list):
-            return [item.strip() for item in content if item.strip()]
-        return []
-    df['last_week_work'] = df['上周三至本周二工作内容'].apply(process_content)
-    df['next_week_plan'] = df['本周三至下周二工作计划'].apply(process_content)
-    other_projects = df[df['项目名称'].str.contains('其他', na=False)]
-
-    # 统计数据
-    total_people = df['姓名'].nunique()
-    pool_df = df[df['工作类型'] == '入池']
-    pool_people = pool_df['姓名'].nunique()
-    pool_departments = df['入池部门'].dropna().unique()
-    pool_departments_str = '、'.join(pool_departments)
-    pool_departments_count = len(pool_departments)
-    project_names = df['项目名称'].dropna().unique()
-    # 排除"其他"
-    project_names = [name for name in project_names if '其他' not in str(name)]
-    project_names_str = '、'.join(project_names)
-    project_count = len(project_names)
-    grouped_data = {
-        '入池': pool_df,
-        '入项': df[df['工作类型'] == '入项']
-    }
-    recruitment_stats = {
-        'resume': int(df['通过简历数量'].sum()),
-        'interview': int(df['面试人员数量'].sum()),
-        'pass': int(df['面试通过人员数量'].sum())
-    }
-    def remove_leading_number(text):
-        return re.sub(r'^[\d一二三四五六七八九十]+[\.|、|\)|\s]+', '', str(text).strip())
-    def is_other_project(name):
-        return '其他' in str(name)
-    
-    # 入项、入池分为"常规项目"和"其他项目"，此时所有DataFrame都带有last_week_work/next_week_plan
-    regular_initem = grouped_data['入项'][~grouped_data['入项']['项目名称'].apply(is_other_project)]
-    other_initem = grouped_data['入项'][grouped_data['入项']['项目名称'].apply(is_other_project)]
-    regular_pool = grouped_data['入池'][~grouped_data['入池']['项目名称'].apply(is_other_project)]
-    other_pool = grouped_data['入池'][grouped_data['入池']['项目名称'].apply(is_other_project)]
-
-    doc = Document()
-    style = doc.styles['Normal']
-    style.font.name = '宋体'
-    style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-
-    # 标题1（红色、加粗、居中、字号21）
-    p = doc.add_paragraph()
-    run = p.add_run('北银金融科技有限责任公司')
-    run.font.size = Pt(21)
-    run.bold = True
-    run.font.color.rgb = RGBColor(0xE6, 0x19, 0x19)  # 红色
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.paragraph_format.space_after = Pt(0)
-    # 标题2（红色、加粗、居中、字号21）
-    p = doc.add_paragraph()
-    run = p.add_run('产品研发部综合业务组周例会会议纪要')
-    run.font.size = Pt(21)
-    run.bold = True
-    run.font.color.rgb = RGBColor(0xE6, 0x19, 0x19)
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.paragraph_format.space_after = Pt(8)
-    # 期数（居中，字号18）
-    p = doc.add_paragraph()
-    run = p.add_run(f'{pd.Timestamp.now().year} 年第 {issue} 期')
-    run.font.size = Pt(18)
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.paragraph_format.space_after = Pt(2)
-    # 部门和日期（两列，居中，字号16）
-    table = doc.add_table(rows=1, cols=2)
-    table.alignment = 1  # 居中
-    table.autofit = True
-    table.allow_autofit = True
-    table.columns[0].width = Cm(7)
-    table.columns[1].width = Cm(7)
-    cell1 = table.cell(0, 0)
-    cell2 = table.cell(0, 1)
-    p1 = cell1.paragraphs[0]
-    run1 = p1.add_run('产品研发部')
-    run1.font.size = Pt(16)
-    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p2 = cell2.paragraphs[0]
-    run2 = p2.add_run(date_str)
-    run2.font.size = Pt(16)
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    # 分割线（黑色粗线）
-    p = doc.add_paragraph()
-    p.paragraph_format.space_after = Pt(8)
-    p.paragraph_format.space_before = Pt(8)
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run('')
-    border = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), '16')  # 粗线
-    bottom.set(qn('w:color'), '000000')
-    border.append(bottom)
-    p._p.get_or_add_pPr().append(border)
-    # 空行
-    doc.add_paragraph()
-    # 一级标题
-    p = doc.add_paragraph()
-    run = p.add_run('一、当周工作情况')
-    run.bold = True
-    run.font.size = Pt(13)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    # 概要段落
-    summary = f"产品研发部综合业务组共计{total_people}人，组内有{pool_people}人入池{pool_departments_str}{pool_departments_count}个部门，支持行内日常工作。组内目前支持{project_count}个项目，包括{project_names_str}。"
-    para = doc.add_paragraph(summary)
-    para.paragraph_format.first_line_indent = Cm(1)
-    para.paragraph_format.space_after = Pt(6)
-    para.paragraph_format.line_spacing = 1.5
-    para = doc.add_paragraph('汇报详情如下：')
-    para.paragraph_format.first_line_indent = Cm(1)
-    para.paragraph_format.space_after = Pt(6)
-    para.paragraph_format.line_spacing = 1.5
-    doc.add_paragraph()
-    # 二级标题
-    p = doc.add_paragraph()
-    run = p.add_run('1.综合业务组')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('1)项目进展')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    if not regular_initem.empty:
-        for _, row in regular_initem.iterrows():
+        # 报头
+        get_masthead().add_to_docx(doc, self.issue_text, self.date_str)
+        # 空行
+        doc.add_paragraph()
+        # 一级标题
+        p = doc.add_paragraph()
+        run = p.add_run('一、当周工作情况')
+        run.bold = True
+        run.font.size = Pt(13)
+        p.paragraph_format.space_after = Pt(4)
+        p.paragraph_format.first_line_indent = Cm(0)
+        p.paragraph_format.line_spacing = 1.5
+        # 概要段落
+        para = doc.add_paragraph(self.summary_text)
+        para.paragraph_format.first_line_indent = Cm(1)
+        para.paragraph_format.space_after = Pt(6)
+        para.paragraph_format.line_spacing = 1.5
+        para = doc.add_paragraph('汇报详情如下：')
+        para.paragraph_format.first_line_indent = Cm(1)
+        para.paragraph_format.space_after = Pt(6)
+        para.paragraph_format.line_spacing = 1.5
+        doc.add_paragraph()
+        for number, (title, section) in enumerate(self.sections, 1):
+            total_people = section.summary['total_people']
+            pool_people = section.summary['pool_people']
+            # 二级标题
             p = doc.add_paragraph()
-            run = p.add_run(f'•{row["项目名称"]}（{row["项目阶段"]}）')
+            run = p.add_run(f'{number}.{title}')
             run.bold = True
             run.font.size = Pt(11)
-            p.paragraph_format.space_after = Pt(1)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('1)项目进展')
+            run.bold = True
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
             p.paragraph_format.first_line_indent = Cm(0)
             p.paragraph_format.line_spacing = 1.5
-            # 添加项目具体工作内容
-            if isinstance(row['last_week_work'], list):
-                filtered_tasks = [remove_leading_number(task) for task in row['last_week_work'] if task.strip()]
-                for idx, task in enumerate(filtered_tasks, 1):
+            for project_name, project_stage, tasks in section._initem_rows('last_week_work'):
+                p = doc.add_paragraph()
+                run = p.add_run(f'•{project_name}（{project_stage}）')
+                run.bold = True
+                run.font.size = Pt(11)
+                p.paragraph_format.space_after = Pt(1)
+                p.paragraph_format.first_line_indent = Cm(0)
+                p.paragraph_format.line_spacing = 1.5
+                # 添加项目具体工作内容
+                for idx, task in enumerate(tasks, 1):
                     para = doc.add_paragraph(f'{idx}、{task}')
                     # 设置列表样式，与PDF的ChineseList类似
                     para.paragraph_format.left_indent = Cm(0.5) # 根据需要调整缩进
@@ -560,178 +948,273 @@ def generate_word_report(excel_path, output_path, issue, date_str):
                         r.font.size = Pt(11)
                         r.font.name = '宋体' # 或其他中文字体
                         r._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('2)入池工作')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    p = doc.add_paragraph()
-    run = p.add_run(f"目前组内有{total_people}人，{pool_people}人入池。")
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(1)
-    p.paragraph_format.first_line_indent = Cm(1)
-    p.paragraph_format.line_spacing = 1.5
-    pool_no_other = pool_df[~pool_df['项目名称'].apply(is_other_project)]
-    for dept, dept_group in pool_no_other.groupby('入池部门'):
-        dept_people = dept_group['姓名'].nunique()
-        para = doc.add_paragraph(f'•{dept}（{dept_people}人）')
-        para.paragraph_format.first_line_indent = Cm(0)
-        para.paragraph_format.space_after = Pt(1)
-        para.paragraph_format.line_spacing = 1.5
-        for project_name, proj_group in dept_group.groupby('项目名称'):
-            project_stage = proj_group.iloc[0]['项目阶段']
-            para = doc.add_paragraph()
-            run = para.add_run(f'{project_name}（{project_stage}）')
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('2)入池工作')
             run.bold = True
-            para.paragraph_format.first_line_indent = Cm(0)
-            para.paragraph_format.space_after = Pt(1)
-            para.paragraph_format.line_spacing = 1.5
-            all_tasks = []
-            for _, row in proj_group.iterrows():
-                if isinstance(row['last_week_work'], list):
-                    all_tasks.extend([remove_leading_number(task) for task in row['last_week_work'] if task.strip()])
-            for idx, task in enumerate(all_tasks, 1):
-                para = doc.add_paragraph(f'{idx}、{task}')
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            p = doc.add_paragraph()
+            run = p.add_run(f"目前组内有{total_people}人，{pool_people}人入池。")
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(1)
+            p.paragraph_format.first_line_indent = Cm(1)
+            p.paragraph_format.line_spacing = 1.5
+            for dept, dept_people, projects in section._pool_rows('last_week_work'):
+                para = doc.add_paragraph(f'•{dept}（{dept_people}人）')
                 para.paragraph_format.first_line_indent = Cm(0)
                 para.paragraph_format.space_after = Pt(1)
                 para.paragraph_format.line_spacing = 1.5
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('3)其他工作')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    if not other_projects.empty:
-        for _, row in other_projects.iterrows():
-            if isinstance(row['last_week_work'], list):
-                tasks = [remove_leading_number(task) for task in row['last_week_work'] if task.strip()]
+                for project_name, project_stage, all_tasks in projects:
+                    para = doc.add_paragraph()
+                    run = para.add_run(f'{project_name}（{project_stage}）')
+                    run.bold = True
+                    para.paragraph_format.first_line_indent = Cm(0)
+                    para.paragraph_format.space_after = Pt(1)
+                    para.paragraph_format.line_spacing = 1.5
+                    for idx, task in enumerate(all_tasks, 1):
+                        para = doc.add_paragraph(f'{idx}、{task}')
+                        para.paragraph_format.first_line_indent = Cm(0)
+                        para.paragraph_format.space_after = Pt(1)
+                        para.paragraph_format.line_spacing = 1.5
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('3)其他工作')
+            run.bold = True
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            for tasks in section._other_rows('last_week_work'):
                 for task in tasks:
                     para = doc.add_paragraph(f'•{task}')
                     para.paragraph_format.first_line_indent = Cm(0)
                     para.paragraph_format.space_after = Pt(1)
                     para.paragraph_format.line_spacing = 1.5
-    para = doc.add_paragraph(f'•招聘：简历通过{recruitment_stats["resume"]}份，面试{recruitment_stats["interview"]}人，通过{recruitment_stats["pass"]}人')
-    para.paragraph_format.first_line_indent = Cm(0)
-    para.paragraph_format.space_after = Pt(6)
-    para.paragraph_format.line_spacing = 1.5
-    # 一级标题
-    p = doc.add_paragraph()
-    run = p.add_run('二、下周工作计划')
-    run.bold = True
-    run.font.size = Pt(13)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    para = doc.add_paragraph('下一周产品研发部综合业务组将按计划有序推进各项目和部门入池工作，各项工作计划如下：')
-    para.paragraph_format.first_line_indent = Cm(1)
-    para.paragraph_format.space_after = Pt(6)
-    para.paragraph_format.line_spacing = 1.5
-    doc.add_paragraph()
-    # 二级标题
-    p = doc.add_paragraph()
-    run = p.add_run('1.综合业务组')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('1)项目进展')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    if not regular_initem.empty:
-        for _, row in regular_initem.iterrows():
+            para = doc.add_paragraph(section.recruitment_text)
+            para.paragraph_format.first_line_indent = Cm(0)
+            para.paragraph_format.space_after = Pt(6)
+            para.paragraph_format.line_spacing = 1.5
+        # 一级标题
+        p = doc.add_paragraph()
+        run = p.add_run('二、下周工作计划')
+        run.bold = True
+        run.font.size = Pt(13)
+        p.paragraph_format.space_after = Pt(4)
+        p.paragraph_format.first_line_indent = Cm(0)
+        p.paragraph_format.line_spacing = 1.5
+        para = doc.add_paragraph('下一周产品研发部综合业务组将按计划有序推进各项目和部门入池工作，各项工作计划如下：')
+        para.paragraph_format.first_line_indent = Cm(1)
+        para.paragraph_format.space_after = Pt(6)
+        para.paragraph_format.line_spacing = 1.5
+        doc.add_paragraph()
+        for number, (title, section) in enumerate(self.sections, 1):
+            total_people = section.summary['total_people']
+            pool_people = section.summary['pool_people']
+            # 二级标题
             p = doc.add_paragraph()
-            run = p.add_run(f'•{row["项目名称"]}（{row["项目阶段"]}）')
+            run = p.add_run(f'{number}.{title}')
             run.bold = True
             run.font.size = Pt(11)
-            p.paragraph_format.space_after = Pt(1)
+            p.paragraph_format.space_after = Pt(2)
             p.paragraph_format.first_line_indent = Cm(0)
             p.paragraph_format.line_spacing = 1.5
-            if isinstance(row['next_week_plan'], list):
-                filtered_plans = [remove_leading_number(task) for task in row['next_week_plan'] if task.strip()]
-                for idx, task in enumerate(filtered_plans, 1):
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('1)项目进展')
+            run.bold = True
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            for project_name, project_stage, plans in section._initem_rows('next_week_plan'):
+                p = doc.add_paragraph()
+                run = p.add_run(f'•{project_name}（{project_stage}）')
+                run.bold = True
+                run.font.size = Pt(11)
+                p.paragraph_format.space_after = Pt(1)
+                p.paragraph_format.first_line_indent = Cm(0)
+                p.paragraph_format.line_spacing = 1.5
+                for idx, task in enumerate(plans, 1):
                     para = doc.add_paragraph(f'{idx}、{task}')
                     para.paragraph_format.first_line_indent = Cm(0)
                     para.paragraph_format.space_after = Pt(1)
                     para.paragraph_format.line_spacing = 1.5
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('2)入池工作')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    p = doc.add_paragraph()
-    run = p.add_run(f"目前组内有{total_people}人，{pool_people}人入池。")
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(1)
-    p.paragraph_format.first_line_indent = Cm(1)
-    p.paragraph_format.line_spacing = 1.5
-    pool_no_other = pool_df[~pool_df['项目名称'].apply(is_other_project)]
-    for dept, dept_group in pool_no_other.groupby('入池部门'):
-        dept_people = dept_group['姓名'].nunique()
-        para = doc.add_paragraph(f'•{dept}（{dept_people}人）')
-        para.paragraph_format.first_line_indent = Cm(0)
-        para.paragraph_format.space_after = Pt(1)
-        para.paragraph_format.line_spacing = 1.5
-        for project_name, proj_group in dept_group.groupby('项目名称'):
-            project_stage = proj_group.iloc[0]['项目阶段']
-            para = doc.add_paragraph()
-            run = para.add_run(f'{project_name}（{project_stage}）')
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('2)入池工作')
             run.bold = True
-            para.paragraph_format.first_line_indent = Cm(0)
-            para.paragraph_format.space_after = Pt(1)
-            para.paragraph_format.line_spacing = 1.5
-            all_tasks = []
-            for _, row in proj_group.iterrows():
-                if isinstance(row['next_week_plan'], list):
-                    all_tasks.extend([remove_leading_number(task) for task in row['next_week_plan'] if task.strip()])
-            for idx, task in enumerate(all_tasks, 1):
-                para = doc.add_paragraph(f'{idx}、{task}')
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            p = doc.add_paragraph()
+            run = p.add_run(f"目前组内有{total_people}人，{pool_people}人入池。")
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(1)
+            p.paragraph_format.first_line_indent = Cm(1)
+            p.paragraph_format.line_spacing = 1.5
+            for dept, dept_people, projects in section._pool_rows('next_week_plan'):
+                para = doc.add_paragraph(f'•{dept}（{dept_people}人）')
                 para.paragraph_format.first_line_indent = Cm(0)
                 para.paragraph_format.space_after = Pt(1)
                 para.paragraph_format.line_spacing = 1.5
-    # 三级标题
-    p = doc.add_paragraph()
-    run = p.add_run('3)其他工作')
-    run.bold = True
-    run.font.size = Pt(11)
-    p.paragraph_format.space_after = Pt(2)
-    p.paragraph_format.first_line_indent = Cm(0)
-    p.paragraph_format.line_spacing = 1.5
-    other_projects = df[df['项目名称'].str.contains('其他', na=False)]
-    if not other_projects.empty:
-        for _, row in other_projects.iterrows():
-            if isinstance(row['next_week_plan'], list):
-                plans = [remove_leading_number(task) for task in row['next_week_plan'] if task.strip()]
+                for project_name, project_stage, all_tasks in projects:
+                    para = doc.add_paragraph()
+                    run = para.add_run(f'{project_name}（{project_stage}）')
+                    run.bold = True
+                    para.paragraph_format.first_line_indent = Cm(0)
+                    para.paragraph_format.space_after = Pt(1)
+                    para.paragraph_format.line_spacing = 1.5
+                    for idx, task in enumerate(all_tasks, 1):
+                        para = doc.add_paragraph(f'{idx}、{task}')
+                        para.paragraph_format.first_line_indent = Cm(0)
+                        para.paragraph_format.space_after = Pt(1)
+                        para.paragraph_format.line_spacing = 1.5
+            # 三级标题
+            p = doc.add_paragraph()
+            run = p.add_run('3)其他工作')
+            run.bold = True
+            run.font.size = Pt(11)
+            p.paragraph_format.space_after = Pt(2)
+            p.paragraph_format.first_line_indent = Cm(0)
+            p.paragraph_format.line_spacing = 1.5
+            for plans in section._other_rows('next_week_plan'):
                 for plan in plans:
                     para = doc.add_paragraph(f'•{plan}')
                     para.paragraph_format.first_line_indent = Cm(0)
                     para.paragraph_format.space_after = Pt(1)
                     para.paragraph_format.line_spacing = 1.5
-    para = doc.add_paragraph('•招聘：持续招聘工作')
-    para.paragraph_format.first_line_indent = Cm(0)
-    para.paragraph_format.space_after = Pt(6)
-    para.paragraph_format.line_spacing = 1.5
-    doc.save(output_path)
+            para = doc.add_paragraph('•招聘：持续招聘工作')
+            para.paragraph_format.first_line_indent = Cm(0)
+            para.paragraph_format.space_after = Pt(6)
+            para.paragraph_format.line_spacing = 1.5
+        _save_docx(doc, output_path)
+
+    def run(self):
+        """运行生成器"""
+        self.load_excel_data()
+        self.generate_pdf()
+
+def _save_docx(doc, output_path):
+    """保存Word，ZIP条目使用固定时间戳，相同输入生成相同字节"""
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            info = zipfile.ZipInfo(item.filename, date_time=DOCX_ZIP_TIMESTAMP)
+            info.compress_type = item.compress_type
+            info.external_attr = item.external_attr
+            dst.writestr(info, src.read(item.filename))
+
+def generate_reports(excel_path, issue, date_str, pdf_path=None, docx_path=None, sheet_name=0):
+    """解析一次Excel，生成PDF和/或Word，返回行数和各阶段耗时
+
+    sheet_name为ALL_SHEETS或名称列表时多个工作表合并为一份报告。
+    """
+    timings = {}
+    start = time.perf_counter()
+    generator = WeeklyReportGenerator(excel_path, pdf_path, issue, date_str, sheet_name)
+    generator.load_excel_data()
+    timings['parse_seconds'] = time.perf_counter() - start
+    return _render_outputs(generator, pdf_path, docx_path, timings)
+
+def generate_reports_from_rows(rows, issue, date_str, pdf_path=None, docx_path=None):
+    """使用已解析的数据行（DataFrame或MemberEntry列表）生成PDF和/或Word，不再读取Excel
+
+    rows为{工作表名: DataFrame}（read_excel_sheets的结果）时多个工作表合并为一份报告。
+    输出与generate_reports读取同一工作表的结果相同，可在工作进程中执行。
+    """
+    timings = {}
+    start = time.perf_counter()
+    generator = WeeklyReportGenerator(None, pdf_path, issue, date_str)
+    if isinstance(rows, dict):
+        generator.load_sheets(rows)
+    else:
+        generator.load_rows(rows)
+    timings['load_seconds'] = time.perf_counter() - start
+    return _render_outputs(generator, pdf_path, docx_path, timings)
+
+def _render_outputs(generator, pdf_path, docx_path, timings):
+    if pdf_path:
+        generator.output_path = pdf_path
+        start = time.perf_counter()
+        generator.generate_pdf()
+        timings['pdf_seconds'] = time.perf_counter() - start
+    if docx_path:
+        start = time.perf_counter()
+        generator.generate_word(docx_path)
+        timings['docx_seconds'] = time.perf_counter() - start
+    return dict(rows=generator.row_count, **{key: round(value, 3) for key, value in timings.items()})
+
+def sheet_output_path(path, sheet):
+    """按工作表分别生成时的输出路径：周报.pdf -> 周报-工作表名.pdf"""
+    stem, ext = os.path.splitext(path)
+    # 工作表名中不能用于文件名的字符替换为下划线
+    sheet = re.sub(r'[\\/:*?"<>|]', '_', str(sheet))
+    return f"{stem}-{sheet}{ext}"
+
+def generate_sheet_reports(excel_path, issue, date_str, pdf_path=None, docx_path=None, sheet_name=ALL_SHEETS):
+    """工作簿只解析一次，每个工作表各生成一份报告
+
+    输出路径由pdf_path/docx_path加工作表名得到，返回{工作表名: 统计信息}。
+    """
+    start = time.perf_counter()
+    frames = read_excel_sheets(excel_path, sheet_name)
+    parse_seconds = time.perf_counter() - start
+    results = {}
+    for sheet, df in frames.items():
+        generator = WeeklyReportGenerator(None, None, issue, date_str)
+        generator.load_dataframe(df)
+        results[sheet] = _render_outputs(
+            generator,
+            pdf_path and sheet_output_path(pdf_path, sheet),
+            docx_path and sheet_output_path(docx_path, sheet),
+            {'parse_seconds': parse_seconds / len(frames)}
+        )
+    return results
+
+def generate_word_report(excel_path, output_path, issue, date_str):
+    """由Excel生成Word报告"""
+    generator = WeeklyReportGenerator(excel_path, output_path, issue, date_str)
+    generator.load_excel_data()
+    generator.generate_word(output_path)
+
+def main():
+    parser = argparse.ArgumentParser(description='由周报Excel生成PDF/Word')
+    parser.add_argument('excel_path', nargs='?', default='sample_data.xlsx', help='周报Excel路径')
+    parser.add_argument('--issue', default='1', help='期数')
+    parser.add_argument('--date', dest='date_str', default='2024年1月1日', help='日期，如2025年5月20日')
+    parser.add_argument('--pdf', help='PDF输出路径')
+    parser.add_argument('--docx', help='Word输出路径')
+    parser.add_argument('--no-cache', action='store_true', help='不使用生成结果缓存')
+    sheets = parser.add_mutually_exclusive_group()
+    sheets.add_argument('--sheet', action='append', help='工作表名称，可重复指定，多个工作表合并为一份报告；默认第一个工作表')
+    sheets.add_argument('--all-sheets', action='store_true', help='读取全部工作表')
+    parser.add_argument('--per-sheet', action='store_true', help='每个工作表各生成一份报告，文件名后加工作表名')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    outputs = {'pdf': args.pdf, 'docx': args.docx}
+    if not any(outputs.values()):
+        outputs['pdf'] = 'weekly_report.pdf'
+    outputs = {fmt: path for fmt, path in outputs.items() if path}
+    sheet_name = ALL_SHEETS if args.all_sheets else (args.sheet or 0)
+    if args.per_sheet:
+        results = generate_sheet_reports(args.excel_path, args.issue, args.date_str,
+                                         pdf_path=outputs.get('pdf'), docx_path=outputs.get('docx'),
+                                         sheet_name=ALL_SHEETS if sheet_name == 0 else sheet_name)
+        logging.info(f"已按工作表生成：{'、'.join(results)}")
+        return
+    if args.no_cache:
+        generate_reports(args.excel_path, args.issue, args.date_str,
+                         pdf_path=outputs.get('pdf'), docx_path=outputs.get('docx'), sheet_name=sheet_name)
+    else:
+        from artifact_cache import ArtifactCache
+        ArtifactCache().render_to(args.excel_path, args.issue, args.date_str, outputs, sheet_name=sheet_name)
+    logging.info(f"已生成：{', '.join(outputs.values())}")
 
 if __name__ == "__main__":
-    # 示例使用
-    generator = WeeklyReportGenerator(
-        excel_path="sample_data.xlsx",
-        output_path="weekly_report.pdf",
-        issue="1",
-        date_str="2024年1月1日"
-    )
-    generator.run() 
\ No newline at end of file
+    main()
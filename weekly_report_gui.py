@@ -1,18 +1,29 @@
 import sys
 import os
-import pandas as pd
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QFileDialog, 
                             QMessageBox, QTableWidget, QTableWidgetItem, 
                             QHeaderView, QTextEdit, QComboBox, QLineEdit)
-from PyQt6.QtCore import Qt
-from weekly_report_generator import WeeklyReportGenerator
+from PyQt6.QtCore import Qt, pyqtSignal
+from artifact_cache import ArtifactCache
+from render_pool import RenderPool
+from session_model import PREVIEW_COLUMNS, WorkbookSession
 
 class WeeklyReportGUI(QMainWindow):
+    # 后台解析完成（文件路径, 该次解析的future），在界面线程中处理
+    parsed = pyqtSignal(str, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("综合组周报生成器")
         self.setMinimumSize(800, 600)
+        self.cache = ArtifactCache()
+        # 单个生成进程在后台预热，不阻塞窗口显示
+        self.pool = RenderPool(workers=1, warm=False)
+        self.pool.warm(block=False)
+        # 选择文件后在后台解析一次，预览和导出共用解析结果
+        self.session = WorkbookSession()
+        self.parsed.connect(self._on_parsed)
         
         # 创建主窗口部件
         main_widget = QWidget()
@@ -48,12 +59,8 @@ class WeeklyReportGUI(QMainWindow):
         
         # 创建数据表格
         self.table = QTableWidget()
-        self.table.setColumnCount(11)
-        self.table.setHorizontalHeaderLabels([
-            "工号", "姓名", "工作类型", "项目名称/入池机构-项目名称", 
-            "项目阶段", "上周三至本周二工作内容", "本周三至下周二工作计划",
-            "问题反馈", "通过简历数量", "面试人员数量", "面试通过人员数量"
-        ])
+        self.table.setColumnCount(len(PREVIEW_COLUMNS))
+        self.table.setHorizontalHeaderLabels(PREVIEW_COLUMNS)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.table)
         
@@ -83,6 +90,29 @@ class WeeklyReportGUI(QMainWindow):
         )
         if file_path:
             self.excel_path.setText(file_path)
+            self.statusBar().showMessage("正在解析...")
+            self._parse_future = self.session.load(file_path)
+            self._parse_future.add_done_callback(lambda future: self.parsed.emit(file_path, future))
+
+    def _on_parsed(self, file_path, future):
+        """后台解析完成：仍是最近一次选择的文件时填充表格，失败时在状态栏提示"""
+        # 之后又选择了文件（或同一文件重新解析）时忽略较早完成的结果
+        if file_path != self.excel_path.text() or future is not self._parse_future:
+            return
+        error = future.exception()
+        if error is not None:
+            self.statusBar().showMessage(f"解析失败: {str(error)}")
+        else:
+            self._fill_table(future.result())
+
+    def _fill_table(self, model):
+        """用解析结果填充表格"""
+        rows = list(model.preview_rows())
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                self.table.setItem(i, j, QTableWidgetItem(value))
+        self.statusBar().showMessage(f"数据加载成功（{len(rows)}行）")
     
     def load_data(self):
         """加载Excel数据到表格"""
@@ -91,19 +121,8 @@ class WeeklyReportGUI(QMainWindow):
             QMessageBox.warning(self, "警告", "请先选择Excel文件")
             return
         try:
-            # 读取Excel数据
-            df = pd.read_excel(excel_path)
-            # 动态设置表头
-            self.table.setColumnCount(len(df.columns))
-            self.table.setHorizontalHeaderLabels([str(col) for col in df.columns])
-            # 设置表格行数
-            self.table.setRowCount(len(df))
-            # 填充表格数据
-            for i, row in df.iterrows():
-                for j, value in enumerate(row):
-                    item = QTableWidgetItem(str(value))
-                    self.table.setItem(i, j, item)
-            self.statusBar().showMessage("数据加载成功")
+            # 文件未修改时直接使用已有的解析结果
+            self._fill_table(self.session.get(excel_path))
         except Exception as e:
             QMessageBox.critical(self, "错误", f"加载数据失败: {str(e)}")
     
@@ -126,8 +145,10 @@ class WeeklyReportGUI(QMainWindow):
                 "PDF文件 (*.pdf)"
             )
             if save_path:
-                generator = WeeklyReportGenerator(excel_path, save_path, issue, date_str)
-                generator.run()
+                # 相同文件、期数和日期直接复制缓存结果；未命中时由已解析的数据行生成
+                model = self.session.get(excel_path)
+                self.cache.render_to(None, issue, date_str, {'pdf': save_path}, pool=self.pool,
+                                     digest=model.digest, rows=model.rows)
                 QMessageBox.information(self, "成功", "PDF文件下载成功！")
                 self.statusBar().showMessage("PDF文件下载成功")
                 os.system(f"open '{save_path}'")
@@ -153,14 +174,21 @@ class WeeklyReportGUI(QMainWindow):
                 "Word文件 (*.docx)"
             )
             if save_path:
-                from weekly_report_generator import generate_word_report
-                generate_word_report(excel_path, save_path, issue, date_str)
+                model = self.session.get(excel_path)
+                self.cache.render_to(None, issue, date_str, {'docx': save_path}, pool=self.pool,
+                                     digest=model.digest, rows=model.rows)
                 QMessageBox.information(self, "成功", "Word文件下载成功！")
                 self.statusBar().showMessage("Word文件下载成功")
                 os.system(f"open '{save_path}'")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"下载Word失败: {str(e)}")
 
+    def closeEvent(self, event):
+        """关闭窗口时结束生成进程"""
+        self.pool.shutdown(wait=False)
+        self.session.shutdown()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = WeeklyReportGUI()